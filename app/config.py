@@ -4,12 +4,58 @@ from pathlib import Path
 
 class Settings(BaseSettings):
     DATABASE_URL: str = ""
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements cached per connection
+    DATABASE_READ_URL: str = ""  # optional read replica for read-only routes
+    READ_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    READ_REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0
+    READ_REPLICA_CHECK_TIMEOUT_SECONDS: float = 1.0
+    DB_PGBOUNCER: bool = False  # pgbouncer in transaction mode: no cached or named prepared statements
     ANTHROPIC_API_KEY: str = ""
     UPLOAD_DIR: str = str(Path(__file__).resolve().parent.parent / "uploads")
     BACKEND_CORS_ORIGINS: str = "http://localhost:3000"
     SUPABASE_URL: str = ""
     SUPABASE_SERVICE_KEY: str = ""
     SUPABASE_STORAGE_BUCKET: str = "document"
+    STORAGE_BACKEND: str = "supabase"  # "supabase" or "local"
+    LOCAL_STORAGE_DIR: str = str(Path(__file__).resolve().parent.parent / "storage")
+    ANTHROPIC_BASE_URL: str = ""
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_STALE_AFTER_SECONDS: int = 900
+    JOB_HEARTBEAT_SECONDS: float = 60.0
+    JOB_RETRY_BACKOFF_SECONDS: float = 30.0
+    PDF_EXTRACT_WORKERS: int = 2
+    PDF_EXTRACT_MAX_CONCURRENCY: int = 4
+    PDF_PARALLEL_MIN_PAGES: int = 20
+    CODE_INDEX_CHECK_INTERVAL_SECONDS: int = 60
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_LRU_SIZE: int = 256
+    ANTHROPIC_MAX_CONNECTIONS: int = 20
+    ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    ANTHROPIC_TIMEOUT_SECONDS: float = 300.0
+    ANTHROPIC_MAX_IN_FLIGHT: int = 8
+    ANTHROPIC_TOKENS_PER_MINUTE: int = 80000
+    ANTHROPIC_RATE_LIMIT_COUNT_CACHE_READS: bool = False
+    EXTRACTION_CHUNK_THRESHOLD_TOKENS: int = 60000
+    EXTRACTION_CHUNK_TOKENS: int = 30000
+    BILLING_STATS_USE_COUNTERS: bool = False
+    SEARCH_TRIGRAM_MIN_LENGTH: int = 3
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    UPLOAD_MAX_BYTES: int = 200 * 1024 * 1024
+    BATCH_MAX_FILES: int = 100
+    BATCH_UPLOAD_CONCURRENCY: int = 4
+    WORKER_METRICS_PORT: int = 0
+    STORAGE_MAX_CONNECTIONS: int = 10
+    STORAGE_MAX_KEEPALIVE_CONNECTIONS: int = 5
+    STORAGE_TIMEOUT_SECONDS: float = 120.0
+    STORAGE_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    STORAGE_DOWNLOAD_MODE: str = "proxy"  # "proxy" (stream through the API) or "redirect" (signed URL)
+    STORAGE_SIGNED_URL_TTL_SECONDS: int = 300
 
     model_config = {
         "env_file": [
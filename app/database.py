@@ -1,12 +1,62 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+import logging
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind; 0 when it has replayed everything it received
+# (an idle primary would otherwise make the last replay timestamp look stale)
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def _connect_args() -> dict:
+    if settings.DB_PGBOUNCER:
+        # Transaction-mode pgbouncer hands each transaction to any server
+        # connection, so prepared statements must be neither cached nor reused by name
+        return {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+
+
+def make_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=_connect_args(),
+    )
+
+
+engine = make_engine(settings.DATABASE_URL)
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+read_engine = make_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
+read_session = (
+    async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False) if read_engine else None
+)
+
+_replica_lag: float | None = None
+_replica_checked_at = 0.0
+_replica_lock: asyncio.Lock | None = None
+
 
 class Base(DeclarativeBase):
     pass
@@ -15,3 +65,70 @@ class Base(DeclarativeBase):
 async def get_db():
     async with async_session() as session:
         yield session
+
+
+async def get_read_db():
+    """Session for read-only routes: the replica when it is reachable and caught up, else the primary."""
+    factory = read_session if read_session and await replica_usable() else async_session
+    async with factory() as session:
+        yield session
+
+
+async def replica_usable() -> bool:
+    """Whether replica lag is within READ_REPLICA_MAX_LAG_SECONDS.
+
+    Lag is measured at most every READ_REPLICA_CHECK_INTERVAL_SECONDS; an
+    unreachable replica counts as unusable until the next check. Requests that
+    arrive while a check is running use the last known lag instead of waiting.
+    """
+    global _replica_lock
+    if read_engine is None:
+        return False
+    if time.monotonic() - _replica_checked_at >= settings.READ_REPLICA_CHECK_INTERVAL_SECONDS:
+        if _replica_lock is None:
+            _replica_lock = asyncio.Lock()
+        if not _replica_lock.locked():
+            async with _replica_lock:
+                await _check_replica()
+    return _replica_lag is not None and _replica_lag <= settings.READ_REPLICA_MAX_LAG_SECONDS
+
+
+async def _check_replica() -> None:
+    global _replica_lag, _replica_checked_at
+    try:
+        # Bounded: a replica that does not answer must not hold up the request
+        _replica_lag = await asyncio.wait_for(_measure_lag(), settings.READ_REPLICA_CHECK_TIMEOUT_SECONDS)
+    except Exception:
+        logger.warning("Read replica check failed; reading from the primary", exc_info=True)
+        _replica_lag = None
+    _replica_checked_at = time.monotonic()
+
+
+async def _measure_lag() -> float:
+    async with read_engine.connect() as conn:
+        return float((await conn.execute(REPLICA_LAG_SQL)).scalar_one())
+
+
+def replica_status() -> dict:
+    """Last observed replica state, for the health endpoint."""
+    if read_engine is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "lag_seconds": _replica_lag,
+        "in_use": _replica_lag is not None and _replica_lag <= settings.READ_REPLICA_MAX_LAG_SECONDS,
+        "pool": pool_stats(read_engine),
+    }
+
+
+def pool_stats(db_engine: AsyncEngine = engine) -> dict[str, int]:
+    """Connection pool occupancy: configured size, idle, checked out and overflow connections."""
+    pool = db_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
@@ -1,13 +1,55 @@
-from fastapi import FastAPI
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+from sqlalchemy import select, func
 
 from app.config import settings
-from app.routers import documents, billing_notes
+from app.database import async_session, pool_stats, replica_status
+from app.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    EXTRACTION_JOBS,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    mark_process_dead,
+    render_metrics,
+)
+from app.models.job import Job
+from app.routers import documents, billing_notes, jobs, codes
+from app.services.claude_service import init_client, close_client, get_limiter
+from app.services.code_index import get_code_index
+from app.services.pdf_service import extraction_queue_depth, shutdown_extraction_executor
+from app.services.storage_service import init_storage_client, close_storage_client
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_client()
+    init_storage_client()
+    try:
+        async with async_session() as db:
+            await get_code_index(db)
+    except Exception:
+        # Not fatal: the index loads on first use instead
+        logger.exception("Could not preload the code index")
+    yield
+    await close_client()
+    await close_storage_client()
+    shutdown_extraction_executor()
+    mark_process_dead()
+
 
 app = FastAPI(
     title="MedBill AI",
     description="Medical Billing Notes - CPT Code Extraction",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -16,12 +58,81 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Document-Id", "Accept-Ranges", "Content-Range", "Content-Length"],
 )
 
-app.include_router(documents.router, prefix="/api/documents", tags=["Documents"])
-app.include_router(billing_notes.router, prefix="/api/billing-notes", tags=["Billing Notes"])
+# Full path template per included route. scope["route"] is the router's own
+# route object, whose path lacks the include prefix ("/{document_id}", or ""
+# for a router's root), so metrics labels are looked up here instead.
+_route_templates: dict[int, str] = {}  # keyed by id(route): routes are not hashable
+
+
+def _include_router(router, prefix: str, tags: list[str]) -> None:
+    app.include_router(router, prefix=prefix, tags=tags)
+    for route in router.routes:
+        _route_templates[id(route)] = prefix + getattr(route, "path", "")
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    HTTP_REQUESTS_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+        # Label by route template ("/api/documents/{document_id}"), not the raw path
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.labels(
+            method=request.method,
+            route=_route_templates.get(id(route)) or getattr(route, "path", "unmatched"),
+            status=str(status),
+        ).observe(time.perf_counter() - started)
+        _sample_pool()
+
+
+def _sample_pool() -> None:
+    stats = pool_stats()
+    if stats:
+        DB_POOL_CHECKED_OUT.set(stats["checked_out"])
+        DB_POOL_OVERFLOW.set(stats["overflow"])
+
+
+_include_router(documents.router, prefix="/api/documents", tags=["Documents"])
+_include_router(billing_notes.router, prefix="/api/billing-notes", tags=["Billing Notes"])
+_include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+_include_router(codes.router, prefix="/api/codes", tags=["Codes"])
 
 
 @app.get("/api/health")
 async def health_check():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "pdf_extraction": extraction_queue_depth(),
+        "llm_limiter": get_limiter().stats(),
+        "db_pool": pool_stats(),
+        "read_replica": replica_status(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    try:
+        async with async_session() as db:
+            result = await db.execute(
+                select(Job.status, func.count(Job.id))
+                .where(Job.status.in_(("queued", "running")))
+                .group_by(Job.status)
+            )
+            counts = dict(result.all())
+        for status in ("queued", "running"):
+            EXTRACTION_JOBS.labels(status=status).set(counts.get(status, 0))
+    except Exception:
+        logger.exception("Could not sample extraction job counts")
+    _sample_pool()
+
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
@@ -0,0 +1,104 @@
+"""Prometheus metrics shared across the app and the worker.
+
+When PROMETHEUS_MULTIPROC_DIR is set (several uvicorn workers), every process
+writes to that directory and /metrics aggregates across them. Per-process
+gauges use "livesum", which only drops a process's values once
+mark_process_dead() has run for it (app and worker shutdown). The directory
+must be emptied before the server starts (the Procfile does this), or files
+from a previous deploy are aggregated too.
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "medbill_pipeline_stage_seconds",
+    "Duration of each document processing stage",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+PIPELINE_RUN_SECONDS = Histogram(
+    "medbill_pipeline_run_seconds",
+    "Duration of a full process_document attempt",
+    ["status"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "medbill_http_request_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "medbill_http_requests_in_flight",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "medbill_db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "medbill_db_pool_overflow",
+    "Database connections open beyond the pool size",
+    multiprocess_mode="livesum",
+)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "medbill_llm_request_seconds",
+    "Claude extraction call latency",
+    ["outcome"],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300),
+)
+
+LLM_TOKENS = Counter(
+    "medbill_llm_tokens",
+    "Claude tokens used, by kind (input, output, cache_read, cache_creation)",
+    ["kind"],
+)
+
+EXTRACTION_JOBS = Gauge(
+    "medbill_extraction_jobs",
+    "Extraction jobs by status (sampled at scrape time)",
+    ["status"],
+    # Derived from the jobs table, so any process's latest sample is the value
+    multiprocess_mode="mostrecent",
+)
+
+PDF_EXTRACTION_QUEUE = Gauge(
+    "medbill_pdf_extraction_queue",
+    "PDF parses waiting for or holding a process-pool slot",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition payload and content type for the /metrics endpoint."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this process's live gauge values from the multiprocess directory."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
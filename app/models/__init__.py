@@ -4,5 +4,24 @@ from app.models.cpt_code import CPTCode
 from app.models.extracted_code import ExtractedCode
 from app.models.icd10_code import ICD10Code
 from app.models.extracted_diagnosis import ExtractedDiagnosis
+from app.models.job import Job
+from app.models.code_index_version import CodeIndexVersion
+from app.models.extraction_cache import ExtractionCacheEntry
+from app.models.billing_note_stats import BillingNoteStats
+from app.models.processing_run import ProcessingRun
+from app.models.document_page import DocumentPage
 
-__all__ = ["Document", "BillingNote", "CPTCode", "ExtractedCode", "ICD10Code", "ExtractedDiagnosis"]
+__all__ = [
+    "Document",
+    "BillingNote",
+    "CPTCode",
+    "ExtractedCode",
+    "ICD10Code",
+    "ExtractedDiagnosis",
+    "Job",
+    "CodeIndexVersion",
+    "ExtractionCacheEntry",
+    "BillingNoteStats",
+    "ProcessingRun",
+    "DocumentPage",
+]
@@ -1,7 +1,7 @@
 import uuid
 from datetime import date, datetime
 
-from sqlalchemy import String, Text, Date, DateTime, ForeignKey
+from sqlalchemy import String, Text, Date, DateTime, ForeignKey, Integer, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -18,6 +18,12 @@ class BillingNote(Base):
     clinical_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
     billing_narrative: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[str] = mapped_column(String(20), default="draft")
+    # Claude usage for the extraction call; null when the result came from the extraction cache
+    llm_input_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    llm_output_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    llm_cache_read_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    llm_cache_creation_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    llm_latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -28,3 +34,37 @@ class BillingNote(Base):
     extracted_diagnoses: Mapped[list["ExtractedDiagnosis"]] = relationship(
         back_populates="billing_note", cascade="all, delete-orphan"
     )
+
+
+Index("ix_billing_notes_created_at_id", BillingNote.created_at.desc(), BillingNote.id.desc())
+# Status-filtered listings (same keyset order) and per-status counts
+Index(
+    "ix_billing_notes_status_created_at_id",
+    BillingNote.status,
+    BillingNote.created_at.desc(),
+    BillingNote.id.desc(),
+)
+
+# Search: trigram GIN indexes for substring/similarity matching, lower() pattern indexes for short prefixes
+Index(
+    "ix_billing_notes_patient_name_trgm",
+    BillingNote.patient_name,
+    postgresql_using="gin",
+    postgresql_ops={"patient_name": "gin_trgm_ops"},
+)
+Index(
+    "ix_billing_notes_provider_name_trgm",
+    BillingNote.provider_name,
+    postgresql_using="gin",
+    postgresql_ops={"provider_name": "gin_trgm_ops"},
+)
+Index(
+    "ix_billing_notes_patient_name_prefix",
+    func.lower(BillingNote.patient_name).label("patient_name_lower"),
+    postgresql_ops={"patient_name_lower": "text_pattern_ops"},
+)
+Index(
+    "ix_billing_notes_provider_name_prefix",
+    func.lower(BillingNote.provider_name).label("provider_name_lower"),
+    postgresql_ops={"provider_name_lower": "text_pattern_ops"},
+)
@@ -0,0 +1,13 @@
+from sqlalchemy import String, BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class BillingNoteStats(Base):
+    """Dashboard counters, one row per bucket: "total", each note status, and "documents"."""
+
+    __tablename__ = "billing_note_stats"
+
+    bucket: Mapped[str] = mapped_column(String(20), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, default=0)
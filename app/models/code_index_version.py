@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class CodeIndexVersion(Base):
+    """Single-row table; bump ``version`` after changing cpt_codes or icd10_codes
+    so running processes reload their in-memory code index."""
+
+    __tablename__ = "code_index_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, default=1)
+    version: Mapped[int] = mapped_column(Integer, default=1)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
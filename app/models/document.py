@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, Text, Integer, DateTime
+from sqlalchemy import String, Text, Integer, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -13,9 +14,16 @@ class Document(Base):
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     filename: Mapped[str] = mapped_column(String(255))
     file_path: Mapped[str] = mapped_column(Text)
-    file_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
-    extracted_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    file_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, unique=True, index=True)
+    # Full text of documents extracted before document_pages existed. Deferred:
+    # it can be hundreds of KB and is not loaded unless a query asks for it.
+    extracted_text: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    # [[page_number, start, end], ...] character offsets of each page in the legacy extracted_text
+    page_offsets: Mapped[list | None] = mapped_column(JSONB, nullable=True)
     page_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
     uploaded_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     billing_notes: Mapped[list["BillingNote"]] = relationship(back_populates="document")
+
+
+Index("ix_documents_uploaded_at_id", Document.uploaded_at.desc(), Document.id.desc())
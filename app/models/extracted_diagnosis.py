@@ -10,7 +10,9 @@ class ExtractedDiagnosis(Base):
     __tablename__ = "extracted_diagnoses"
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
-    billing_note_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("billing_notes.id", ondelete="CASCADE"))
+    billing_note_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("billing_notes.id", ondelete="CASCADE"), index=True
+    )
     icd10_code_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("icd10_codes.id"), nullable=True)
     icd10_code_raw: Mapped[str] = mapped_column(String(10))
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
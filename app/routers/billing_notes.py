@@ -2,12 +2,13 @@
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db
 from app.models.billing_note import BillingNote
 from app.models.document import Document
 from app.models.extracted_code import ExtractedCode
@@ -25,58 +26,79 @@ from app.schemas.billing_note import (
     ExtractedDiagnosisResponse,
 )
 
+from app.services.pagination import keyset_page, next_cursor
+from app.services.search_service import apply_note_search, is_ranked_search
+from app.services.stats_service import (
+    get_counter_stats,
+    get_exact_stats,
+    note_deleted,
+    note_status_changed,
+)
+
 router = APIRouter()
 
 
 @router.get("", response_model=list[BillingNoteResponse])
 async def list_billing_notes(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header; replaces skip"),
     status: str | None = Query(None, description="Filter by status: draft, reviewed, finalized"),
-    search: str | None = Query(None, description="Search by patient name"),
-    db: AsyncSession = Depends(get_db),
+    search: str | None = Query(None, description="Search by patient or provider name"),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List billing notes with optional filters."""
-    query = select(BillingNote).order_by(BillingNote.created_at.desc())
+    """List billing notes with optional filters.
+
+    The next page's cursor is returned in the X-Next-Cursor header. Searches of
+    SEARCH_TRIGRAM_MIN_LENGTH+ characters are ranked by similarity and paged with skip.
+    """
+    query = select(BillingNote)
 
     if status:
         query = query.where(BillingNote.status == status)
+
+    if search and is_ranked_search(search):
+        if cursor:
+            raise HTTPException(status_code=400, detail="cursor is not supported with ranked search; use skip")
+        query = apply_note_search(query, search)
+        query = query.order_by(BillingNote.created_at.desc(), BillingNote.id.desc()).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
     if search:
-        query = query.where(BillingNote.patient_name.ilike(f"%{search}%"))
+        query = apply_note_search(query, search)
+
+    try:
+        query = keyset_page(query, BillingNote.created_at, BillingNote.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not cursor:
+        query = query.offset(skip)
 
-    query = query.offset(skip).limit(limit)
     result = await db.execute(query)
-    return result.scalars().all()
+    notes = result.scalars().all()
+    token = next_cursor(notes, limit, "created_at")
+    if token:
+        response.headers["X-Next-Cursor"] = token
+    return notes
 
 
 @router.get("/stats")
-async def get_billing_stats(db: AsyncSession = Depends(get_db)):
+async def get_billing_stats(
+    exact: bool = Query(False, description="Count rows directly instead of reading the stats counters"),
+    db: AsyncSession = Depends(get_read_db),
+):
     """Get dashboard statistics."""
-    total = await db.execute(select(func.count(BillingNote.id)))
-    draft = await db.execute(
-        select(func.count(BillingNote.id)).where(BillingNote.status == "draft")
-    )
-    reviewed = await db.execute(
-        select(func.count(BillingNote.id)).where(BillingNote.status == "reviewed")
-    )
-    finalized = await db.execute(
-        select(func.count(BillingNote.id)).where(BillingNote.status == "finalized")
-    )
-    documents = await db.execute(select(func.count(Document.id)))
-
-    return {
-        "total_notes": total.scalar() or 0,
-        "draft": draft.scalar() or 0,
-        "reviewed": reviewed.scalar() or 0,
-        "finalized": finalized.scalar() or 0,
-        "total_documents": documents.scalar() or 0,
-    }
+    if settings.BILLING_STATS_USE_COUNTERS and not exact:
+        return await get_counter_stats(db)
+    return await get_exact_stats(db)
 
 
 @router.get("/{note_id}", response_model=BillingNoteDetailResponse)
 async def get_billing_note(
     note_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a billing note with all extracted CPT codes."""
     result = await db.execute(
@@ -112,9 +134,12 @@ async def update_billing_note(
     if not note:
         raise HTTPException(status_code=404, detail="Billing note not found")
 
+    old_status = note.status
     update_data = update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(note, key, value)
+    if note.status != old_status:
+        await note_status_changed(db, old_status, note.status)
 
     await db.commit()
     await db.refresh(note)
@@ -133,6 +158,7 @@ async def delete_billing_note(
         raise HTTPException(status_code=404, detail="Billing note not found")
 
     await db.delete(note)
+    await note_deleted(db, note.status)
     await db.commit()
     return {"detail": "Billing note deleted"}
 
@@ -0,0 +1,38 @@
+"""CPT / ICD-10 reference code lookups, served from the in-memory code index."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.schemas.code import CodeLookupResponse
+from app.services.code_index import get_code_index
+
+router = APIRouter()
+
+
+@router.get("/cpt/{code}", response_model=CodeLookupResponse)
+async def get_cpt_code(
+    code: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """Look up a CPT code."""
+    index = await get_code_index(db)
+    code = code.strip().upper()
+    ref = index.cpt.get(code)
+    if not ref:
+        raise HTTPException(status_code=404, detail="CPT code not found")
+    return CodeLookupResponse(id=ref.id, code=code, description=ref.description, category=ref.category)
+
+
+@router.get("/icd10/{code}", response_model=CodeLookupResponse)
+async def get_icd10_code(
+    code: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """Look up an ICD-10-CM code."""
+    index = await get_code_index(db)
+    code = code.strip().upper()
+    ref = index.icd10.get(code)
+    if not ref:
+        raise HTTPException(status_code=404, detail="ICD-10 code not found")
+    return CodeLookupResponse(id=ref.id, code=code, description=ref.description, category=ref.category)
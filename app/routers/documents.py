@@ -1,50 +1,77 @@
 """Document upload and management routes."""
 
-import hashlib
+import asyncio
 import os
 import uuid
+import zipfile
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse, Response
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from supabase import create_client
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.metrics import PIPELINE_STAGE_SECONDS
 from app.models.document import Document
-from app.schemas.document import DocumentResponse, DocumentDetailResponse
+from app.models.processing_run import ProcessingRun
+from app.schemas.document import (
+    DocumentResponse,
+    DocumentDetailResponse,
+    DocumentPageTextResponse,
+    DocumentUploadResponse,
+    DocumentExistsRequest,
+    DocumentExistsResponse,
+    BatchUploadResponse,
+    ProcessingRunResponse,
+)
+from app.services.batch_service import create_batch
 from app.services.billing_service import process_document
+from app.services.document_text import load_document_text, load_page_text
+from app.services.job_service import enqueue_extraction
+from app.services.pagination import keyset_page, next_cursor
+from app.services.pdf_service import page_offsets
+from app.services.stats_service import documents_created
+from app.services.upload_service import (
+    SpooledFile,
+    UploadTooLarge,
+    hash_upload,
+    remove_quietly,
+    spool_zip_entries,
+)
+from app.services.storage_service import (
+    create_signed_url,
+    is_storage_path,
+    local_pdf_path,
+    open_pdf_stream,
+    upload_pdf_file,
+)
 
 router = APIRouter()
 
 
-def _get_supabase():
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
-
-
-def _get_public_url(storage_path: str) -> str:
-    """Build the public URL for a file in Supabase Storage."""
-    return f"{settings.SUPABASE_URL}/storage/v1/object/public/{settings.SUPABASE_STORAGE_BUCKET}/{storage_path}"
-
-
-@router.post("/upload", response_model=DocumentResponse)
+@router.post("/upload", response_model=DocumentUploadResponse)
 async def upload_document(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
 ):
-    """Upload a PDF and trigger CPT code extraction."""
+    """Upload a PDF and queue CPT code extraction.
+
+    Returns immediately; poll ``GET /api/jobs/{job_id}`` for the extraction result.
+    """
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are accepted")
 
-    content = await file.read()
+    # Hash the body where Starlette spooled it; memory use is bounded by UPLOAD_CHUNK_SIZE
+    try:
+        file_hash, _ = await hash_upload(file)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
     # Check for duplicate by file hash
-    file_hash = hashlib.sha256(content).hexdigest()
-    existing = await db.execute(
-        select(Document).where(Document.file_hash == file_hash)
-    )
-    existing_doc = existing.scalar_one_or_none()
+    existing_doc = await _find_by_hash(db, file_hash)
     if existing_doc:
         return existing_doc
 
@@ -52,78 +79,219 @@ async def upload_document(
     safe_filename = f"{file_id}_{file.filename}"
     storage_path = f"pdfs/{safe_filename}"
 
-    # Upload to Supabase Storage
-    supabase = _get_supabase()
-    supabase.storage.from_(settings.SUPABASE_STORAGE_BUCKET).upload(
-        path=storage_path,
-        file=content,
-        file_options={"content-type": "application/pdf"},
-    )
-
-    # Save locally as temp file for pdfplumber text extraction
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    local_path = os.path.join(settings.UPLOAD_DIR, safe_filename)
-    with open(local_path, "wb") as f:
-        f.write(content)
-
-    # Create document record — file_path stores local path during processing
+    # Insert first: the unique index on file_hash makes a concurrent upload of
+    # the same bytes wait here and then fail, before it touches storage.
     document = Document(
         id=file_id,
         filename=file.filename,
-        file_path=local_path,
+        file_path=storage_path,
         file_hash=file_hash,
     )
     db.add(document)
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        existing_doc = await _find_by_hash(db, file_hash)
+        if existing_doc:
+            return existing_doc
+        raise
+
+    # Upload to Supabase Storage — the worker reads the PDF from there
+    with PIPELINE_STAGE_SECONDS.labels(stage="storage_upload").time():
+        await upload_pdf_file(storage_path, file.file)
+
+    await documents_created(db)
+
+    # Extraction runs in the worker (python -m app.worker)
+    job = await enqueue_extraction(db, document.id)
     await db.commit()
 
-    # Process document (extract text + CPT codes)
-    try:
-        await process_document(document.id, db)
-    except Exception as e:
-        print(f"Processing error (document saved): {e}")
+    response = DocumentUploadResponse.model_validate(document)
+    response.job_id = job.id
+    return response
 
-    # After extraction, update file_path to Supabase storage path and clean up local
-    document.file_path = storage_path
-    await db.commit()
 
+@router.post("/batch", response_model=BatchUploadResponse)
+async def upload_batch(
+    files: list[UploadFile] = File(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """Upload many PDFs, or a single ZIP of PDFs, and queue extraction for each new one.
+
+    Returns a batch id (see ``GET /api/jobs/batches/{batch_id}``) and a status per file.
+    """
+    is_zip = len(files) == 1 and (files[0].filename or "").lower().endswith(".zip")
+    if not is_zip and len(files) > settings.BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"Batch is limited to {settings.BATCH_MAX_FILES} files")
+
+    spooled: list[SpooledFile] = []
     try:
-        os.remove(local_path)
-    except OSError:
-        pass
+        if is_zip:
+            try:
+                await hash_upload(files[0])
+                spooled = await asyncio.to_thread(spool_zip_entries, files[0].file, settings.BATCH_MAX_FILES)
+            except UploadTooLarge as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail="Invalid ZIP archive")
+        else:
+            # Plain PDFs are uploaded straight from the files Starlette spooled
+            for file in files:
+                name = file.filename or ""
+                if not name.lower().endswith(".pdf"):
+                    spooled.append(SpooledFile(filename=name, error="Only PDF files are accepted"))
+                    continue
+                try:
+                    sha256, size = await hash_upload(file)
+                except UploadTooLarge as e:
+                    spooled.append(SpooledFile(filename=name, error=str(e)))
+                    continue
+                spooled.append(SpooledFile(filename=name, file=file.file, sha256=sha256, size=size))
+
+        return await create_batch(db, spooled)
+    finally:
+        for f in spooled:
+            if f.path:
+                remove_quietly(f.path)
+
+
+@router.head("/exists")
+async def document_exists_head(
+    sha256: str = Query(..., pattern=r"^[0-9a-fA-F]{64}$"),
+    db: AsyncSession = Depends(get_db),
+):
+    """200 if a document with this sha256 is already stored (id in X-Document-Id), else 404."""
+    result = await db.execute(select(Document.id).where(Document.file_hash == sha256.lower()))
+    document_id = result.scalar_one_or_none()
+    if not document_id:
+        return Response(status_code=404)
+    return Response(status_code=200, headers={"X-Document-Id": str(document_id)})
+
+
+@router.post("/exists", response_model=DocumentExistsResponse)
+async def document_exists(
+    body: DocumentExistsRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """Check a client-computed sha256 so the client can skip uploading bytes we already have."""
+    document = await _find_by_hash(db, body.sha256.lower())
+    return DocumentExistsResponse(exists=document is not None, document=document)
 
-    await db.refresh(document)
-    return document
+
+async def _find_by_hash(db: AsyncSession, file_hash: str) -> Document | None:
+    result = await db.execute(select(Document).where(Document.file_hash == file_hash))
+    return result.scalar_one_or_none()
 
 
 @router.get("", response_model=list[DocumentResponse])
 async def list_documents(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header; replaces skip"),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List all uploaded documents."""
-    result = await db.execute(
-        select(Document).order_by(Document.uploaded_at.desc()).offset(skip).limit(limit)
-    )
-    return result.scalars().all()
+    """List all uploaded documents.
+
+    The next page's cursor is returned in the X-Next-Cursor header.
+    """
+    try:
+        query = keyset_page(select(Document), Document.uploaded_at, Document.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not cursor:
+        query = query.offset(skip)
+
+    result = await db.execute(query)
+    documents = result.scalars().all()
+    token = next_cursor(documents, limit, "uploaded_at")
+    if token:
+        response.headers["X-Next-Cursor"] = token
+    return documents
 
 
 @router.get("/{document_id}", response_model=DocumentDetailResponse)
 async def get_document(
     document_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single document with extracted text."""
     result = await db.execute(select(Document).where(Document.id == document_id))
     document = result.scalar_one_or_none()
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
-    return document
+
+    # Text is assembled from document_pages only here, not on every Document load
+    return DocumentDetailResponse(
+        id=document.id,
+        filename=document.filename,
+        page_count=document.page_count,
+        uploaded_at=document.uploaded_at,
+        file_path=document.file_path,
+        extracted_text=await load_document_text(db, document_id),
+    )
+
+
+@router.get("/{document_id}/text", response_model=DocumentPageTextResponse)
+async def get_document_page_text(
+    document_id: uuid.UUID,
+    page: int = Query(1, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get the extracted text of one page from document_pages.
+
+    Documents extracted before per-page storage are sliced in SQL from
+    documents.extracted_text using the stored page offsets.
+    """
+    result = await db.execute(
+        select(Document.page_count, Document.page_offsets).where(Document.id == document_id)
+    )
+    row = result.one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Document not found")
+    page_count, offsets = row
+    if page_count is not None and page > page_count:
+        raise HTTPException(status_code=404, detail=f"Document has {page_count} pages")
+
+    text = await load_page_text(db, document_id, page)
+    if text is None:
+        text = await _legacy_page_text(db, document_id, page, offsets)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Text has not been extracted yet")
+
+    return DocumentPageTextResponse(document_id=document_id, page=page, page_count=page_count, text=text)
+
+
+async def _legacy_page_text(
+    db: AsyncSession, document_id: uuid.UUID, page: int, offsets: list | None
+) -> str | None:
+    if offsets is None:
+        # Compute the offsets once from the full text and keep them
+        result = await db.execute(select(Document.extracted_text).where(Document.id == document_id))
+        text = result.scalar_one()
+        if text is None:
+            return None
+        offsets = page_offsets(text)
+        document = await db.get(Document, document_id)
+        document.page_offsets = offsets
+        await db.commit()
+
+    # Pages with no extractable text have no entry
+    span = next(((start, end) for number, start, end in offsets if number == page), None)
+    if span is None:
+        return ""
+    start, end = span
+    result = await db.execute(
+        select(func.substr(Document.extracted_text, start + 1, end - start)).where(Document.id == document_id)
+    )
+    return result.scalar_one()
 
 
 @router.post("/{document_id}/reprocess")
 async def reprocess_document(
     document_id: uuid.UUID,
+    force: bool = Query(False, description="Bypass the extraction cache and call Claude again"),
     db: AsyncSession = Depends(get_db),
 ):
     """Re-run CPT/ICD-10 extraction on an existing document. Creates a new billing note."""
@@ -133,42 +301,88 @@ async def reprocess_document(
         raise HTTPException(status_code=404, detail="Document not found")
 
     try:
-        billing_note = await process_document(document.id, db)
+        billing_note = await process_document(document.id, db, force=force)
         return {"detail": "Document reprocessed", "billing_note_id": str(billing_note.id)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Reprocessing failed: {e}")
 
 
+@router.get("/{document_id}/runs", response_model=list[ProcessingRunResponse])
+async def list_processing_runs(
+    document_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List processing attempts for a document with per-stage timings, newest first."""
+    result = await db.execute(
+        select(ProcessingRun)
+        .where(ProcessingRun.document_id == document_id)
+        .order_by(ProcessingRun.started_at.desc())
+    )
+    return result.scalars().all()
+
+
+# Upstream headers a range-aware PDF viewer needs
+_PROXIED_HEADERS = ("content-length", "content-range", "accept-ranges", "etag", "last-modified")
+
+
 @router.get("/{document_id}/download")
 async def download_document(
     document_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Serve the PDF inline — from Supabase Storage (new) or local disk (old)."""
+    """Serve the PDF inline — from Supabase Storage (new) or local disk (old).
+
+    Storage objects are streamed through with Range requests passed along, or,
+    with STORAGE_DOWNLOAD_MODE="redirect", answered with a redirect to a
+    short-lived signed URL.
+    """
     result = await db.execute(select(Document).where(Document.id == document_id))
     document = result.scalar_one_or_none()
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
+    # The dependency is only closed after the body has been sent; release the
+    # connection now instead of holding it idle in transaction for the transfer
+    await db.close()
 
     # New uploads: file_path starts with "pdfs/" (Supabase storage path)
-    if document.file_path.startswith("pdfs/"):
-        supabase = _get_supabase()
-        file_bytes = supabase.storage.from_(settings.SUPABASE_STORAGE_BUCKET).download(
-            document.file_path
-        )
-        return Response(
-            content=file_bytes,
+    if is_storage_path(document.file_path):
+        local_path = local_pdf_path(document.file_path)
+        if local_path is not None:
+            return _local_file_response(local_path, document.filename)
+
+        if settings.STORAGE_DOWNLOAD_MODE == "redirect":
+            url = await create_signed_url(document.file_path, settings.STORAGE_SIGNED_URL_TTL_SECONDS)
+            return RedirectResponse(url, status_code=307)
+
+        upstream = await open_pdf_stream(document.file_path, request.headers.get("range"))
+        if upstream.status_code not in (200, 206, 416):
+            await upstream.aclose()
+            if upstream.status_code in (400, 404):
+                raise HTTPException(status_code=404, detail="PDF file not found")
+            raise HTTPException(status_code=502, detail="Storage download failed")
+
+        headers = {name: upstream.headers[name] for name in _PROXIED_HEADERS if name in upstream.headers}
+        headers["Content-Disposition"] = f'inline; filename="{document.filename}"'
+        return StreamingResponse(
+            upstream.aiter_raw(settings.UPLOAD_CHUNK_SIZE),
+            status_code=upstream.status_code,
             media_type="application/pdf",
-            headers={"Content-Disposition": f'inline; filename="{document.filename}"'},
+            headers=headers,
+            background=BackgroundTask(upstream.aclose),
         )
 
     # Old uploads: file_path is a local disk path
-    if os.path.exists(document.file_path):
-        return FileResponse(
-            path=document.file_path,
-            media_type="application/pdf",
-            filename=document.filename,
-            content_disposition_type="inline",
-        )
-
-    raise HTTPException(status_code=404, detail="PDF file not found")
+    return _local_file_response(document.file_path, document.filename)
+
+
+def _local_file_response(path: str, filename: str) -> FileResponse:
+    # FileResponse answers Range requests itself
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="PDF file not found")
+    return FileResponse(
+        path=path,
+        media_type="application/pdf",
+        filename=filename,
+        content_disposition_type="inline",
+    )
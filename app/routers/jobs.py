@@ -0,0 +1,39 @@
+"""Extraction job status routes."""
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models.job import Job
+from app.schemas.job import JobResponse
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get the status of an extraction job."""
+    result = await db.execute(select(Job).where(Job.id == job_id))
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/batches/{batch_id}", response_model=list[JobResponse])
+async def list_batch_jobs(
+    batch_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    """List the extraction jobs queued by a batch upload."""
+    result = await db.execute(select(Job).where(Job.batch_id == batch_id).order_by(Job.created_at))
+    jobs = result.scalars().all()
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return jobs
@@ -47,6 +47,11 @@ class BillingNoteDetailResponse(BillingNoteResponse):
     extracted_codes: list[ExtractedCodeResponse]
     extracted_diagnoses: list[ExtractedDiagnosisResponse] = []
     document_filename: str | None = None
+    llm_input_tokens: int | None = None
+    llm_output_tokens: int | None = None
+    llm_cache_read_tokens: int | None = None
+    llm_cache_creation_tokens: int | None = None
+    llm_latency_ms: int | None = None
 
     model_config = {"from_attributes": True}
 
@@ -0,0 +1,10 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class CodeLookupResponse(BaseModel):
+    id: UUID
+    code: str
+    description: str
+    category: str
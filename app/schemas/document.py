@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class DocumentResponse(BaseModel):
@@ -18,3 +18,50 @@ class DocumentDetailResponse(DocumentResponse):
     extracted_text: str | None
 
     model_config = {"from_attributes": True}
+
+
+class DocumentPageTextResponse(BaseModel):
+    document_id: UUID
+    page: int
+    page_count: int | None
+    text: str
+
+
+class DocumentUploadResponse(DocumentResponse):
+    job_id: UUID | None = None
+
+
+class DocumentExistsRequest(BaseModel):
+    sha256: str = Field(pattern=r"^[0-9a-fA-F]{64}$")
+
+
+class DocumentExistsResponse(BaseModel):
+    exists: bool
+    document: DocumentResponse | None = None
+
+
+class BatchFileStatus(BaseModel):
+    filename: str
+    status: str  # queued, duplicate, rejected, failed
+    document_id: UUID | None = None
+    job_id: UUID | None = None
+    detail: str | None = None
+
+
+class BatchUploadResponse(BaseModel):
+    batch_id: UUID
+    files: list[BatchFileStatus]
+
+
+class ProcessingRunResponse(BaseModel):
+    id: UUID
+    document_id: UUID
+    billing_note_id: UUID | None
+    status: str
+    started_at: datetime
+    finished_at: datetime | None
+    total_ms: int | None
+    stages: list[dict]
+    error: str | None
+
+    model_config = {"from_attributes": True}
@@ -16,6 +16,14 @@ class ExtractedICD10Code(BaseModel):
     is_primary: bool = False
 
 
+class ExtractionUsage(BaseModel):
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    latency_ms: int = 0
+
+
 class ExtractionResult(BaseModel):
     patient_name: str | None = None
     date_of_service: str | None = None
@@ -24,3 +32,4 @@ class ExtractionResult(BaseModel):
     procedures: list[ExtractedCPTCode]
     diagnoses: list[ExtractedICD10Code] = []
     billing_narrative: str
+    usage: ExtractionUsage | None = None
@@ -0,0 +1,21 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class JobResponse(BaseModel):
+    id: UUID
+    kind: str
+    document_id: UUID
+    status: str
+    attempts: int
+    error: str | None
+    billing_note_id: UUID | None
+    batch_id: UUID | None = None
+    created_at: datetime
+    run_after: datetime | None = None
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,121 @@
+"""Batch uploads: many PDFs (or one ZIP) stored and queued for extraction together."""
+
+import asyncio
+import uuid
+
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.metrics import PIPELINE_STAGE_SECONDS
+from app.models.document import Document
+from app.schemas.document import BatchFileStatus, BatchUploadResponse
+from app.services.job_service import enqueue_extraction
+from app.services.stats_service import documents_created
+from app.services.storage_service import upload_pdf, upload_pdf_file
+from app.services.upload_service import SpooledFile
+
+
+async def create_batch(db: AsyncSession, files: list[SpooledFile]) -> BatchUploadResponse:
+    """Dedupe spooled files by hash, store the new ones and queue their extraction.
+
+    Spool files are left for the caller to remove.
+    """
+    batch_id = uuid.uuid4()
+    statuses: list[BatchFileStatus] = [BatchFileStatus(filename=f.filename, status="queued") for f in files]
+
+    for status, f in zip(statuses, files):
+        if f.error:
+            status.status = "rejected"
+            status.detail = f.error
+
+    # One query for every hash already stored
+    hashes = {f.sha256 for f in files if f.sha256}
+    known: dict[str, uuid.UUID] = {}
+    if hashes:
+        result = await db.execute(select(Document.file_hash, Document.id).where(Document.file_hash.in_(hashes)))
+        known = dict(result.all())
+
+    new: list[tuple[BatchFileStatus, SpooledFile, dict]] = []
+    first_copies: dict[str, BatchFileStatus] = {}
+    repeats: list[tuple[BatchFileStatus, BatchFileStatus]] = []
+    for status, f in zip(statuses, files):
+        if status.status != "queued":
+            continue
+        if f.sha256 in known:
+            status.status = "duplicate"
+            status.document_id = known[f.sha256]
+            continue
+        if f.sha256 in first_copies:
+            repeats.append((status, first_copies[f.sha256]))
+            continue
+        first_copies[f.sha256] = status
+        file_id = uuid.uuid4()
+        row = {
+            "id": file_id,
+            "filename": f.filename,
+            "file_path": f"pdfs/{file_id}_{f.filename}",
+            "file_hash": f.sha256,
+        }
+        new.append((status, f, row))
+
+    if new:
+        # ON CONFLICT skips rows a concurrent upload inserted after our lookup
+        result = await db.execute(
+            insert(Document)
+            .values([row for _, _, row in new])
+            .on_conflict_do_nothing(index_elements=[Document.file_hash])
+            .returning(Document.id)
+        )
+        inserted = set(result.scalars().all())
+        for status, _, row in new:
+            if row["id"] not in inserted:
+                status.status = "duplicate"
+                status.detail = "Uploaded concurrently by another request"
+        new = [item for item in new if item[2]["id"] in inserted]
+
+    failed = await _upload_all(new)
+    if failed:
+        await db.execute(delete(Document).where(Document.id.in_(failed)))
+
+    stored = [(status, row) for status, _, row in new if row["id"] not in failed]
+    for status, row in stored:
+        job = await enqueue_extraction(db, row["id"], batch_id=batch_id)
+        status.document_id = row["id"]
+        status.job_id = job.id
+    await documents_created(db, len(stored))
+    await db.commit()
+
+    # Later copies of the same bytes follow the first one, once its upload has settled
+    for status, first in repeats:
+        if first.status == "queued":
+            status.status = "duplicate"
+        else:
+            status.status = first.status
+            status.detail = first.detail
+        status.document_id = first.document_id
+
+    return BatchUploadResponse(batch_id=batch_id, files=statuses)
+
+
+async def _upload_all(items: list[tuple[BatchFileStatus, SpooledFile, dict]]) -> set[uuid.UUID]:
+    """Upload to storage with at most BATCH_UPLOAD_CONCURRENCY transfers in flight; return failed ids."""
+    semaphore = asyncio.Semaphore(settings.BATCH_UPLOAD_CONCURRENCY)
+    failed: set[uuid.UUID] = set()
+
+    async def upload(status: BatchFileStatus, f: SpooledFile, row: dict) -> None:
+        async with semaphore:
+            try:
+                with PIPELINE_STAGE_SECONDS.labels(stage="storage_upload").time():
+                    if f.file is not None:
+                        await upload_pdf_file(row["file_path"], f.file)
+                    else:
+                        await upload_pdf(row["file_path"], f.path)
+            except Exception as e:
+                status.status = "failed"
+                status.detail = f"Storage upload failed: {e}"
+                failed.add(row["id"])
+
+    await asyncio.gather(*(upload(*item) for item in items))
+    return failed
@@ -1,125 +1,253 @@
 """Billing orchestration service: PDF -> Claude -> Database."""
 
+import logging
+import os
 import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
 from datetime import date, datetime
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.metrics import PIPELINE_RUN_SECONDS
 from app.models.document import Document
 from app.models.billing_note import BillingNote
-from app.models.cpt_code import CPTCode
-from app.models.icd10_code import ICD10Code
 from app.models.extracted_code import ExtractedCode
 from app.models.extracted_diagnosis import ExtractedDiagnosis
+from app.models.processing_run import ProcessingRun
+from app.config import settings
 from app.schemas.extraction import ExtractionResult
-from app.services.pdf_service import extract_text_from_pdf
+from app.services.pdf_service import extract_pages_from_pdf_async, join_pages
 from app.services.claude_service import extract_cpt_codes
+from app.services.code_index import CodeIndex, get_code_index
+from app.services.document_text import load_document_text, save_pages
+from app.services.extraction_cache import extraction_cache_key, get_cached_extraction, store_extraction
+from app.services.stats_service import note_created
+from app.services.storage_service import is_storage_path, download_pdf_to
+from app.services.timing import StageTimer
 
+logger = logging.getLogger(__name__)
 
-async def process_document(document_id: uuid.UUID, db: AsyncSession) -> BillingNote:
-    """Full pipeline: take an uploaded document, extract CPT + ICD-10 codes, create billing note."""
+
+async def process_document(
+    document_id: uuid.UUID,
+    db: AsyncSession,
+    force: bool = False,
+    before_commit: Callable[[BillingNote], Awaitable[None]] | None = None,
+) -> BillingNote:
+    """Full pipeline: take an uploaded document, extract CPT + ICD-10 codes, create billing note.
+
+    A cached extraction for identical text is reused unless ``force`` is set.
+    Every attempt, successful or not, is recorded as a processing_runs row with per-stage timings.
+    ``before_commit`` runs in the note's transaction, so the caller's own
+    bookkeeping (a job's outcome) commits or rolls back together with the note.
+    """
+    timer = StageTimer()
+    started_at = datetime.utcnow()
+    try:
+        billing_note, codes, diagnoses = await _run_pipeline(document_id, db, force, timer)
+    except Exception as e:
+        await db.rollback()
+        try:
+            await _record_run(db, document_id, started_at, timer, "failed", error=str(e))
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            logger.exception("Could not record failed processing run for document %s", document_id)
+        raise
+
+    await _record_run(db, document_id, started_at, timer, "succeeded", billing_note_id=billing_note.id)
+    if before_commit is not None:
+        await before_commit(billing_note)
+    await db.commit()
+
+    # Attach the inserted rows so callers can serialize the note without a reload
+    set_committed_value(billing_note, "extracted_codes", codes)
+    set_committed_value(billing_note, "extracted_diagnoses", diagnoses)
+    return billing_note
+
+
+async def _run_pipeline(
+    document_id: uuid.UUID, db: AsyncSession, force: bool, timer: StageTimer
+) -> tuple[BillingNote, list[ExtractedCode], list[ExtractedDiagnosis]]:
     # 1. Get the document
-    result = await db.execute(select(Document).where(Document.id == document_id))
-    document = result.scalar_one_or_none()
+    with timer.stage("load_document"):
+        result = await db.execute(select(Document).where(Document.id == document_id))
+        document = result.scalar_one_or_none()
+        text = await load_document_text(db, document_id) if document else None
     if not document:
         raise ValueError(f"Document {document_id} not found")
 
     # 2. Extract text from PDF if not already done
-    if not document.extracted_text:
-        text, page_count = extract_text_from_pdf(document.file_path)
-        document.extracted_text = text
-        document.page_count = page_count
-        await db.flush()
-
-    # 3. Send to Claude for CPT + ICD-10 extraction
-    extraction = await extract_cpt_codes(document.extracted_text)
-
-    # 4. Create billing note
-    billing_note = BillingNote(
-        id=uuid.uuid4(),
-        document_id=document.id,
-        patient_name=extraction.patient_name,
-        date_of_service=_parse_date(extraction.date_of_service),
-        provider_name=extraction.provider_name,
-        clinical_summary=extraction.clinical_summary,
-        billing_narrative=extraction.billing_narrative,
-        status="draft",
+    if not text:
+        async with _local_pdf(document, timer) as pdf_path:
+            with timer.stage("text_extraction") as span:
+                pages = await extract_pages_from_pdf_async(pdf_path)
+                text = join_pages(pages)
+                span["pages"] = len(pages)
+                span["chars"] = len(text)
+        await save_pages(db, document.id, pages)
+        document.page_count = len(pages)
+
+    # 3. Send to Claude for CPT + ICD-10 extraction (skipped on a cache hit)
+    with timer.stage("cache_lookup") as span:
+        cache_key = extraction_cache_key(text)
+        extraction = None if force else await get_cached_extraction(db, cache_key)
+        span["hit"] = extraction is not None
+    if extraction is None:
+        with timer.stage("llm_call") as span:
+            extraction = await extract_cpt_codes(text)
+            if extraction.usage:
+                span.update(extraction.usage.model_dump(exclude={"latency_ms"}))
+        await store_extraction(db, cache_key, extraction)
+
+    # 4. Cross-reference codes against the in-memory code index
+    with timer.stage("code_lookup") as span:
+        code_index = await get_code_index(db)
+        note_id = uuid.uuid4()
+        code_rows = _extracted_code_rows(note_id, extraction, code_index)
+        diagnosis_rows = _extracted_diagnosis_rows(note_id, extraction, code_index)
+        span["procedures"] = len(code_rows)
+        span["diagnoses"] = len(diagnosis_rows)
+    logger.info(
+        "Document %s: %d CPT procedures, %d ICD-10 diagnoses (%s)",
+        document_id,
+        len(code_rows),
+        len(diagnosis_rows),
+        ", ".join(d.icd10_code for d in extraction.diagnoses),
     )
-    db.add(billing_note)
-    await db.flush()
 
-    # 5. Create extracted CPT codes
-    print(f"[DEBUG] CPT procedures count: {len(extraction.procedures)}")
-    await _create_extracted_codes(db, billing_note.id, extraction)
+    # 5. Insert billing note, then bulk insert its codes and diagnoses
+    with timer.stage("persistence"):
+        usage = extraction.usage
+        billing_note = await db.scalar(
+            insert(BillingNote)
+            .values(
+                id=note_id,
+                document_id=document.id,
+                patient_name=extraction.patient_name,
+                date_of_service=_parse_date(extraction.date_of_service),
+                provider_name=extraction.provider_name,
+                clinical_summary=extraction.clinical_summary,
+                billing_narrative=extraction.billing_narrative,
+                status="draft",
+                llm_input_tokens=usage.input_tokens if usage else None,
+                llm_output_tokens=usage.output_tokens if usage else None,
+                llm_cache_read_tokens=usage.cache_read_input_tokens if usage else None,
+                llm_cache_creation_tokens=usage.cache_creation_input_tokens if usage else None,
+                llm_latency_ms=usage.latency_ms if usage else None,
+            )
+            .returning(BillingNote)
+        )
+        await note_created(db, billing_note.status)
+        codes = await _insert_rows(db, ExtractedCode, code_rows)
+        diagnoses = await _insert_rows(db, ExtractedDiagnosis, diagnosis_rows)
 
-    # 6. Create extracted ICD-10 diagnoses
-    print(f"[DEBUG] ICD-10 diagnoses count: {len(extraction.diagnoses)}")
-    for d in extraction.diagnoses:
-        print(f"[DEBUG]   - {d.icd10_code}: {d.description}")
-    await _create_extracted_diagnoses(db, billing_note.id, extraction)
+    return billing_note, codes, diagnoses
 
-    await db.commit()
 
-    # 7. Reload with relationships
-    result = await db.execute(
-        select(BillingNote)
-        .where(BillingNote.id == billing_note.id)
-        .options(
-            selectinload(BillingNote.extracted_codes),
-            selectinload(BillingNote.extracted_diagnoses),
+async def _record_run(
+    db: AsyncSession,
+    document_id: uuid.UUID,
+    started_at: datetime,
+    timer: StageTimer,
+    status: str,
+    billing_note_id: uuid.UUID | None = None,
+    error: str | None = None,
+) -> None:
+    total_ms = timer.total_ms()
+    PIPELINE_RUN_SECONDS.labels(status=status).observe(total_ms / 1000)
+    db.add(
+        ProcessingRun(
+            id=uuid.uuid4(),
+            document_id=document_id,
+            billing_note_id=billing_note_id,
+            status=status,
+            started_at=started_at,
+            finished_at=datetime.utcnow(),
+            total_ms=total_ms,
+            stages=timer.stages,
+            error=error,
         )
     )
-    return result.scalar_one()
 
 
-async def _create_extracted_codes(
-    db: AsyncSession,
+async def _insert_rows(db: AsyncSession, model, rows: list[dict]) -> list:
+    """Insert all rows in a single multi-row INSERT ... RETURNING."""
+    if not rows:
+        return []
+    result = await db.scalars(insert(model).returning(model), rows)
+    return list(result.all())
+
+
+def _extracted_code_rows(
     billing_note_id: uuid.UUID,
     extraction: ExtractionResult,
-) -> None:
-    """Create ExtractedCode records, cross-referencing with CPT code table."""
-    result = await db.execute(select(CPTCode))
-    cpt_lookup = {code.code: code for code in result.scalars().all()}
-
+    code_index: CodeIndex,
+) -> list[dict]:
+    """Build ExtractedCode rows, cross-referencing with the CPT code index."""
+    rows = []
     for proc in extraction.procedures:
-        cpt_ref = cpt_lookup.get(proc.cpt_code)
-        extracted = ExtractedCode(
-            id=uuid.uuid4(),
-            billing_note_id=billing_note_id,
-            cpt_code_id=cpt_ref.id if cpt_ref else None,
-            cpt_code_raw=proc.cpt_code,
-            description=proc.description,
-            supporting_text=proc.supporting_text,
-            confidence=proc.confidence,
-            confirmed=False,
+        cpt_ref = code_index.cpt.get(proc.cpt_code)
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "billing_note_id": billing_note_id,
+                "cpt_code_id": cpt_ref.id if cpt_ref else None,
+                "cpt_code_raw": proc.cpt_code,
+                "description": proc.description,
+                "supporting_text": proc.supporting_text,
+                "confidence": proc.confidence,
+                "confirmed": False,
+            }
         )
-        db.add(extracted)
+    return rows
 
 
-async def _create_extracted_diagnoses(
-    db: AsyncSession,
+def _extracted_diagnosis_rows(
     billing_note_id: uuid.UUID,
     extraction: ExtractionResult,
-) -> None:
-    """Create ExtractedDiagnosis records, cross-referencing with ICD-10 code table."""
-    result = await db.execute(select(ICD10Code))
-    icd_lookup = {code.code: code for code in result.scalars().all()}
-
+    code_index: CodeIndex,
+) -> list[dict]:
+    """Build ExtractedDiagnosis rows, cross-referencing with the ICD-10 code index."""
+    rows = []
     for diag in extraction.diagnoses:
-        icd_ref = icd_lookup.get(diag.icd10_code)
-        extracted = ExtractedDiagnosis(
-            id=uuid.uuid4(),
-            billing_note_id=billing_note_id,
-            icd10_code_id=icd_ref.id if icd_ref else None,
-            icd10_code_raw=diag.icd10_code,
-            description=diag.description,
-            supporting_text=diag.supporting_text,
-            confidence=diag.confidence,
-            is_primary=diag.is_primary,
+        icd_ref = code_index.icd10.get(diag.icd10_code)
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "billing_note_id": billing_note_id,
+                "icd10_code_id": icd_ref.id if icd_ref else None,
+                "icd10_code_raw": diag.icd10_code,
+                "description": diag.description,
+                "supporting_text": diag.supporting_text,
+                "confidence": diag.confidence,
+                "is_primary": diag.is_primary,
+            }
         )
-        db.add(extracted)
+    return rows
+
+
+@asynccontextmanager
+async def _local_pdf(document: Document, timer: StageTimer):
+    """Yield a local path to the document's PDF, downloading it from storage if needed."""
+    if not is_storage_path(document.file_path):
+        yield document.file_path
+        return
+
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    local_path = os.path.join(settings.UPLOAD_DIR, f"work_{uuid.uuid4()}.pdf")
+    try:
+        with timer.stage("storage_download") as span:
+            span["bytes"] = await download_pdf_to(document.file_path, local_path)
+        yield local_path
+    finally:
+        try:
+            os.remove(local_path)
+        except OSError:
+            pass
 
 
 def _parse_date(date_str: str | None) -> date | None:
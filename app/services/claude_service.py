@@ -1,11 +1,19 @@
 """Claude AI integration service for neurology CPT + ICD-10 code extraction."""
 
+import asyncio
 import json
+import re
+import time
 
 import anthropic
+import httpx
 
 from app.config import settings
-from app.schemas.extraction import ExtractionResult
+from app.metrics import LLM_REQUEST_SECONDS, LLM_TOKENS
+from app.schemas.extraction import ExtractedCPTCode, ExtractedICD10Code, ExtractionResult, ExtractionUsage
+from app.services.rate_limiter import RateLimiter
+
+MODEL = "claude-sonnet-4-5-20250929"
 
 SYSTEM_PROMPT = """You are an expert neurology medical coder and billing specialist. Your role is to analyze clinical documentation from neurology practices and extract both CPT (Current Procedural Terminology) codes and ICD-10 diagnosis codes.
 
@@ -125,18 +133,97 @@ EXTRACTION_TOOL = {
 }
 
 
+MAX_TOKENS = 4096
+
+_client: anthropic.AsyncAnthropic | None = None
+_limiter: RateLimiter | None = None
+
+
+def init_client() -> anthropic.AsyncAnthropic:
+    """Create the process-wide Anthropic client (called from the app lifespan / worker start)."""
+    global _client
+    if _client is None:
+        _client = anthropic.AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL or None,
+            timeout=settings.ANTHROPIC_TIMEOUT_SECONDS,
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.ANTHROPIC_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def get_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(
+            max_in_flight=settings.ANTHROPIC_MAX_IN_FLIGHT,
+            tokens_per_minute=settings.ANTHROPIC_TOKENS_PER_MINUTE,
+        )
+    return _limiter
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) used for rate-limit reservations."""
+    return len(text) // 4 + 1
+
+
+_PROMPT_TOKENS = _estimate_tokens(SYSTEM_PROMPT + json.dumps(EXTRACTION_TOOL))
+
+# Tools and system prompt are identical on every call; the cache breakpoint on
+# the system block makes that prefix (tools -> system) a prompt-cache hit.
+_CACHED_SYSTEM = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+_CACHED_TOOLS = [EXTRACTION_TOOL]
+
+
 async def extract_cpt_codes(clinical_text: str) -> ExtractionResult:
     """Send clinical text to Claude API and extract CPT + ICD-10 codes.
 
+    Documents estimated above EXTRACTION_CHUNK_THRESHOLD_TOKENS are split on
+    page markers into windows of at most EXTRACTION_CHUNK_TOKENS, extracted
+    concurrently and merged with merge_extractions.
+
     Args:
         clinical_text: The full extracted text from the clinical PDF.
 
     Returns:
         ExtractionResult with patient info, CPT codes, ICD-10 codes, and billing narrative.
     """
-    client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    if _estimate_tokens(clinical_text) <= settings.EXTRACTION_CHUNK_THRESHOLD_TOKENS:
+        return await _extract_single(clinical_text)
+
+    windows = split_into_windows(clinical_text, settings.EXTRACTION_CHUNK_TOKENS)
+    # A failed window cancels the rest instead of letting them spend tokens
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(
+                    _extract_single(window, f"This is part {i + 1} of {len(windows)} of a longer document. ")
+                )
+                for i, window in enumerate(windows)
+            ]
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0]
+    return merge_extractions([task.result() for task in tasks])
 
-    user_message = f"""Analyze the following neurology clinical document and extract all applicable CPT codes and ICD-10 diagnosis codes. Use the submit_extraction tool to provide your results.
+
+async def _extract_single(clinical_text: str, section_note: str = "") -> ExtractionResult:
+    """Run one extraction call over ``clinical_text``."""
+    client = init_client()
+    limiter = get_limiter()
+
+    user_message = f"""Analyze the following neurology clinical document and extract all applicable CPT codes and ICD-10 diagnosis codes. {section_note}Use the submit_extraction tool to provide your results.
 
 CLINICAL DOCUMENT:
 ---
@@ -151,27 +238,182 @@ Instructions:
 - Generate a clinical summary and billing narrative
 - Extract patient name, date of service, and provider name if available"""
 
-    response = await client.messages.create(
-        model="claude-sonnet-4-5-20250929",
-        max_tokens=4096,
-        temperature=0,
-        system=SYSTEM_PROMPT,
-        tools=[EXTRACTION_TOOL],
-        messages=[{"role": "user", "content": user_message}],
-    )
+    # Prompt-cache reads don't count toward Anthropic's input-token rate limit,
+    # so the cached prefix is only reserved when configured to count it. A cache
+    # write (first call) is still settled from the reported usage below.
+    reserved = _estimate_tokens(user_message) + MAX_TOKENS
+    if settings.ANTHROPIC_RATE_LIMIT_COUNT_CACHE_READS:
+        reserved += _PROMPT_TOKENS
+    async with limiter.acquire(reserved):
+        started = time.perf_counter()
+        try:
+            response = await client.messages.create(
+                model=MODEL,
+                max_tokens=MAX_TOKENS,
+                temperature=0,
+                system=_CACHED_SYSTEM,
+                tools=_CACHED_TOOLS,
+                messages=[{"role": "user", "content": user_message}],
+            )
+        except Exception:
+            LLM_REQUEST_SECONDS.labels(outcome="error").observe(time.perf_counter() - started)
+            limiter.settle(reserved, 0)
+            raise
+        elapsed = time.perf_counter() - started
+        LLM_REQUEST_SECONDS.labels(outcome="ok").observe(elapsed)
+        latency_ms = int(elapsed * 1000)
+
+    usage = _usage_from_response(response, latency_ms)
+    LLM_TOKENS.labels(kind="input").inc(usage.input_tokens)
+    LLM_TOKENS.labels(kind="output").inc(usage.output_tokens)
+    LLM_TOKENS.labels(kind="cache_read").inc(usage.cache_read_input_tokens)
+    LLM_TOKENS.labels(kind="cache_creation").inc(usage.cache_creation_input_tokens)
+    used = usage.input_tokens + usage.cache_creation_input_tokens + usage.output_tokens
+    if settings.ANTHROPIC_RATE_LIMIT_COUNT_CACHE_READS:
+        used += usage.cache_read_input_tokens
+    limiter.settle(reserved, used)
 
     # Extract the tool use result
     for block in response.content:
         if block.type == "tool_use" and block.name == "submit_extraction":
-            return ExtractionResult(**block.input)
+            return ExtractionResult(**block.input, usage=usage)
 
     # Fallback: if no tool use, try to parse from text
     for block in response.content:
         if block.type == "text":
             try:
                 data = json.loads(block.text)
-                return ExtractionResult(**data)
-            except (json.JSONDecodeError, ValueError):
+                return ExtractionResult(**data, usage=usage)
+            except (json.JSONDecodeError, ValueError, TypeError):
                 pass
 
     raise ValueError("Claude did not return a valid extraction result")
+
+
+_PAGE_MARKER = re.compile(r"^--- Page \d+ ---$", re.MULTILINE)
+
+
+def split_into_windows(clinical_text: str, max_tokens: int) -> list[str]:
+    """Split text on "--- Page N ---" markers and pack whole pages into windows of at most ``max_tokens``.
+
+    A single page over the budget is cut at line boundaries.
+    """
+    starts = [m.start() for m in _PAGE_MARKER.finditer(clinical_text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    pages = [clinical_text[a:b].strip() for a, b in zip(starts, starts[1:] + [len(clinical_text)])]
+
+    max_chars = max_tokens * 4
+    pieces = []
+    for page in pages:
+        if page:
+            pieces.extend(_cut_lines(page, max_chars))
+
+    windows: list[str] = []
+    current: list[str] = []
+    current_len = 0
+    for piece in pieces:
+        if current and current_len + len(piece) + 2 > max_chars:
+            windows.append("\n\n".join(current))
+            current, current_len = [], 0
+        current.append(piece)
+        current_len += len(piece) + 2
+    if current:
+        windows.append("\n\n".join(current))
+    return windows
+
+
+def _cut_lines(text: str, max_chars: int) -> list[str]:
+    if len(text) <= max_chars:
+        return [text]
+    parts: list[str] = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > max_chars:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(line[:max_chars])
+            line = line[max_chars:]
+        if len(current) + len(line) > max_chars:
+            parts.append(current)
+            current = ""
+        current += line
+    if current:
+        parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def merge_extractions(results: list[ExtractionResult]) -> ExtractionResult:
+    """Deterministically combine per-window extractions into one result.
+
+    Procedures and diagnoses are de-duplicated by code (stripped and
+    upper-cased, which is also the code stored), keeping the entry with the
+    highest confidence (earliest window on ties). Exactly one diagnosis is
+    marked primary: the most confident one any window flagged as primary, or
+    the most confident diagnosis overall if none was flagged. Patient details
+    come from the first window that has them.
+    """
+    procedures: dict[str, ExtractedCPTCode] = {}
+    diagnoses: dict[str, ExtractedICD10Code] = {}
+    flagged_primary: set[str] = set()
+    for result in results:
+        for proc in result.procedures:
+            key = proc.cpt_code.strip().upper()
+            if key not in procedures or proc.confidence > procedures[key].confidence:
+                procedures[key] = proc.model_copy(update={"cpt_code": key})
+        for diag in result.diagnoses:
+            key = diag.icd10_code.strip().upper()
+            if diag.is_primary:
+                flagged_primary.add(key)
+            if key not in diagnoses or diag.confidence > diagnoses[key].confidence:
+                diagnoses[key] = diag.model_copy(update={"icd10_code": key, "is_primary": False})
+
+    merged_diagnoses = list(diagnoses.values())
+    candidates = [d for d in merged_diagnoses if d.icd10_code in flagged_primary] or merged_diagnoses
+    if candidates:
+        primary = max(candidates, key=lambda d: d.confidence)
+        primary.is_primary = True
+
+    usages = [r.usage for r in results if r.usage]
+    usage = None
+    if usages:
+        usage = ExtractionUsage(
+            input_tokens=sum(u.input_tokens for u in usages),
+            output_tokens=sum(u.output_tokens for u in usages),
+            cache_read_input_tokens=sum(u.cache_read_input_tokens for u in usages),
+            cache_creation_input_tokens=sum(u.cache_creation_input_tokens for u in usages),
+            # Windows run concurrently, so wall time is the slowest call
+            latency_ms=max(u.latency_ms for u in usages),
+        )
+
+    return ExtractionResult(
+        patient_name=next((r.patient_name for r in results if r.patient_name), None),
+        date_of_service=next((r.date_of_service for r in results if r.date_of_service), None),
+        provider_name=next((r.provider_name for r in results if r.provider_name), None),
+        clinical_summary=_join_unique(r.clinical_summary for r in results),
+        procedures=list(procedures.values()),
+        diagnoses=merged_diagnoses,
+        billing_narrative=_join_unique(r.billing_narrative for r in results),
+        usage=usage,
+    )
+
+
+def _join_unique(texts) -> str:
+    seen: list[str] = []
+    for text in texts:
+        text = (text or "").strip()
+        if text and text not in seen:
+            seen.append(text)
+    return "\n\n".join(seen)
+
+
+def _usage_from_response(response, latency_ms: int) -> ExtractionUsage:
+    usage = response.usage
+    return ExtractionUsage(
+        input_tokens=usage.input_tokens or 0,
+        output_tokens=usage.output_tokens or 0,
+        cache_read_input_tokens=getattr(usage, "cache_read_input_tokens", None) or 0,
+        cache_creation_input_tokens=getattr(usage, "cache_creation_input_tokens", None) or 0,
+        latency_ms=latency_ms,
+    )
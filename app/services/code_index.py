@@ -0,0 +1,79 @@
+"""Process-wide, read-only index of the CPT and ICD-10 reference tables.
+
+The tables are loaded once (at startup, or on first use) and shared by every
+request. The index is rebuilt when ``code_index_version.version`` changes; the
+version is re-checked at most every CODE_INDEX_CHECK_INTERVAL_SECONDS.
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.code_index_version import CodeIndexVersion
+from app.models.cpt_code import CPTCode
+from app.models.icd10_code import ICD10Code
+
+
+class CodeRef(NamedTuple):
+    id: uuid.UUID
+    description: str
+    category: str
+
+
+class CodeIndex(NamedTuple):
+    version: int
+    cpt: Mapping[str, CodeRef]
+    icd10: Mapping[str, CodeRef]
+
+
+_index: CodeIndex | None = None
+_checked_at = 0.0
+_lock: asyncio.Lock | None = None
+
+
+async def get_code_index(db: AsyncSession) -> CodeIndex:
+    """Return the current code index, loading or reloading it if needed."""
+    global _lock
+    if _index is not None and time.monotonic() - _checked_at < settings.CODE_INDEX_CHECK_INTERVAL_SECONDS:
+        return _index
+
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        # Another caller may have refreshed while we waited
+        if _index is not None and time.monotonic() - _checked_at < settings.CODE_INDEX_CHECK_INTERVAL_SECONDS:
+            return _index
+        return await _refresh(db)
+
+
+async def _refresh(db: AsyncSession) -> CodeIndex:
+    global _index, _checked_at
+    result = await db.execute(select(CodeIndexVersion.version).where(CodeIndexVersion.id == 1))
+    version = result.scalar_one_or_none() or 0
+
+    if _index is None or _index.version != version:
+        _index = CodeIndex(
+            version=version,
+            cpt=await _load_table(db, CPTCode),
+            icd10=await _load_table(db, ICD10Code),
+        )
+    _checked_at = time.monotonic()
+    return _index
+
+
+async def _load_table(db: AsyncSession, model) -> Mapping[str, CodeRef]:
+    # Plain column tuples: no ORM identity map entries for ~70k reference rows
+    result = await db.execute(select(model.code, model.id, model.description, model.category))
+    table = {
+        code: CodeRef(code_id, description, sys.intern(category))
+        for code, code_id, description, category in result.all()
+    }
+    return MappingProxyType(table)
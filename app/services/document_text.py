@@ -0,0 +1,75 @@
+"""Per-page document text: bulk writes at extraction time, lazy assembly of the full text."""
+
+import hashlib
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.document import Document
+from app.models.document_page import DocumentPage
+from app.services.pdf_service import join_pages
+
+# 6 bind parameters per row; asyncpg allows at most 32767 per statement
+_INSERT_BATCH_ROWS = 1000
+
+
+async def save_pages(db: AsyncSession, document_id: uuid.UUID, pages: list[tuple[int, str | None]]) -> None:
+    """Write pages in multi-row INSERTs of _INSERT_BATCH_ROWS, replacing pages from an earlier extraction.
+
+    The caller commits.
+    """
+    if not pages:
+        return
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "document_id": document_id,
+            "page_number": number,
+            "text": text or "",
+            "char_count": len(text or ""),
+            "content_hash": hashlib.sha256((text or "").encode()).hexdigest(),
+        }
+        for number, text in pages
+    ]
+    for start in range(0, len(rows), _INSERT_BATCH_ROWS):
+        stmt = insert(DocumentPage).values(rows[start : start + _INSERT_BATCH_ROWS])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_document_pages_document_page",
+                set_={
+                    "text": stmt.excluded.text,
+                    "char_count": stmt.excluded.char_count,
+                    "content_hash": stmt.excluded.content_hash,
+                },
+            )
+        )
+
+
+async def load_document_text(db: AsyncSession, document_id: uuid.UUID) -> str | None:
+    """Assemble the full "--- Page N ---" text from document_pages.
+
+    Documents extracted before per-page storage fall back to documents.extracted_text.
+    """
+    result = await db.execute(
+        select(DocumentPage.page_number, DocumentPage.text)
+        .where(DocumentPage.document_id == document_id)
+        .order_by(DocumentPage.page_number)
+    )
+    pages = result.all()
+    if pages:
+        return join_pages(pages)
+
+    result = await db.execute(select(Document.extracted_text).where(Document.id == document_id))
+    return result.scalar_one_or_none()
+
+
+async def load_page_text(db: AsyncSession, document_id: uuid.UUID, page_number: int) -> str | None:
+    """Text of a single stored page, or None if the page is not in document_pages."""
+    result = await db.execute(
+        select(DocumentPage.text).where(
+            DocumentPage.document_id == document_id, DocumentPage.page_number == page_number
+        )
+    )
+    return result.scalar_one_or_none()
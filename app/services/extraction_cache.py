@@ -0,0 +1,85 @@
+"""Extraction result cache keyed by a content hash of everything sent to Claude.
+
+Entries live in the extraction_cache table; a small per-process LRU sits in
+front of it. Changing the document text, SYSTEM_PROMPT, EXTRACTION_TOOL or
+MODEL changes the key, so stale results are never served.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.extraction_cache import ExtractionCacheEntry
+from app.schemas.extraction import ExtractionResult
+from app.services.claude_service import MODEL, SYSTEM_PROMPT, EXTRACTION_TOOL
+
+_lru: OrderedDict[str, dict] = OrderedDict()
+
+
+def extraction_cache_key(clinical_text: str) -> str:
+    digest = hashlib.sha256()
+    for part in (
+        clinical_text,
+        SYSTEM_PROMPT,
+        json.dumps(EXTRACTION_TOOL, sort_keys=True),
+        MODEL,
+    ):
+        # Length-prefix each part so boundaries between parts are unambiguous
+        encoded = part.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+async def get_cached_extraction(db: AsyncSession, cache_key: str) -> ExtractionResult | None:
+    """Return the cached extraction for a key, or None on a miss."""
+    if not settings.EXTRACTION_CACHE_ENABLED:
+        return None
+
+    data = _lru_get(cache_key)
+    if data is None:
+        result = await db.execute(
+            select(ExtractionCacheEntry.result).where(ExtractionCacheEntry.cache_key == cache_key)
+        )
+        data = result.scalar_one_or_none()
+        if data is None:
+            return None
+        _lru_put(cache_key, data)
+    return ExtractionResult(**data)
+
+
+async def store_extraction(db: AsyncSession, cache_key: str, extraction: ExtractionResult) -> None:
+    """Upsert an extraction result. Runs in the caller's transaction."""
+    if not settings.EXTRACTION_CACHE_ENABLED:
+        return
+
+    # Usage belongs to the call that produced the result, not to later cache hits
+    data = extraction.model_dump(mode="json", exclude={"usage"})
+    stmt = insert(ExtractionCacheEntry).values(cache_key=cache_key, model=MODEL, result=data)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ExtractionCacheEntry.cache_key],
+        set_={"result": stmt.excluded.result, "created_at": stmt.excluded.created_at},
+    )
+    await db.execute(stmt)
+    _lru_put(cache_key, data)
+
+
+def _lru_get(cache_key: str) -> dict | None:
+    data = _lru.get(cache_key)
+    if data is not None:
+        _lru.move_to_end(cache_key)
+    return data
+
+
+def _lru_put(cache_key: str, data: dict) -> None:
+    if settings.EXTRACTION_CACHE_LRU_SIZE <= 0:
+        return
+    _lru[cache_key] = data
+    _lru.move_to_end(cache_key)
+    while len(_lru) > settings.EXTRACTION_CACHE_LRU_SIZE:
+        _lru.popitem(last=False)
@@ -0,0 +1,145 @@
+"""Postgres-backed job queue for document extraction."""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session
+from app.models.billing_note import BillingNote
+from app.models.job import Job
+from app.services.billing_service import process_document
+
+logger = logging.getLogger(__name__)
+
+
+class JobClaimLost(Exception):
+    """The job was reclaimed (or finished) by another worker while this one ran it."""
+
+
+async def enqueue_extraction(
+    db: AsyncSession, document_id: uuid.UUID, batch_id: uuid.UUID | None = None
+) -> Job:
+    """Queue an extraction job for a document. The caller commits."""
+    job = Job(
+        id=uuid.uuid4(),
+        kind="extract_document",
+        document_id=document_id,
+        status="queued",
+        attempts=0,
+        batch_id=batch_id,
+        created_at=datetime.utcnow(),
+    )
+    db.add(job)
+    return job
+
+
+async def claim_next_job(db: AsyncSession) -> Job | None:
+    """Claim the oldest runnable job, skipping rows locked by other workers.
+
+    Jobs stuck in "running" longer than JOB_STALE_AFTER_SECONDS (a worker
+    died mid-run) are picked up again, unless they have used up
+    JOB_MAX_ATTEMPTS: a document that keeps killing the worker is failed
+    instead of being retried forever. Retried jobs wait until ``run_after``.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS)
+    stale = and_(Job.status == "running", Job.started_at < stale_before)
+    await db.execute(
+        update(Job)
+        .where(stale, Job.attempts >= settings.JOB_MAX_ATTEMPTS)
+        .values(status="failed", error="Worker stopped during the last attempt", finished_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(
+        select(Job)
+        .where(
+            or_(
+                and_(Job.status == "queued", or_(Job.run_after.is_(None), Job.run_after <= now)),
+                stale,
+            )
+        )
+        .order_by(Job.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        await db.commit()
+        return None
+
+    job.status = "running"
+    job.attempts += 1
+    job.started_at = datetime.utcnow()
+    job.error = None
+    await db.commit()
+    return job
+
+
+async def run_job(db: AsyncSession, job: Job) -> None:
+    """Execute a claimed job and record its outcome.
+
+    The job is marked succeeded in the same transaction that creates the
+    billing note, so a crash between the two cannot leave a note behind a job
+    that will run again. While it runs, a heartbeat keeps ``started_at`` fresh
+    so a long extraction is not reclaimed as stale. Every outcome is only
+    written if this worker still owns the attempt it claimed.
+    """
+    job_id, attempt = job.id, job.attempts
+    owned = (Job.id == job_id, Job.status == "running", Job.attempts == attempt)
+
+    async def complete(billing_note: BillingNote) -> None:
+        result = await db.execute(
+            update(Job)
+            .where(*owned)
+            .values(status="succeeded", billing_note_id=billing_note.id, finished_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            raise JobClaimLost(f"Job {job_id} attempt {attempt} is no longer running on this worker")
+
+    heartbeat = asyncio.create_task(_heartbeat(job_id, attempt))
+    try:
+        await process_document(job.document_id, db, before_commit=complete)
+    except JobClaimLost:
+        await db.rollback()
+        logger.warning("Job %s attempt %d was reclaimed by another worker; discarding its result", job_id, attempt)
+    except Exception as e:
+        await db.rollback()
+        logger.exception("Job %s failed (attempt %d)", job_id, attempt)
+        job = await db.get(Job, job_id)
+        if job is None or job.status != "running" or job.attempts != attempt:
+            return
+        job.error = str(e)
+        if job.attempts < settings.JOB_MAX_ATTEMPTS:
+            job.status = "queued"
+            # Exponential backoff so a failing job does not go straight back to the head of the queue
+            delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+            job.run_after = datetime.utcnow() + timedelta(seconds=delay)
+        else:
+            job.status = "failed"
+            job.finished_at = datetime.utcnow()
+        await db.commit()
+    finally:
+        heartbeat.cancel()
+
+
+async def _heartbeat(job_id: uuid.UUID, attempt: int) -> None:
+    """Refresh ``started_at`` every JOB_HEARTBEAT_SECONDS on a separate session."""
+    while True:
+        await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+        try:
+            async with async_session() as db:
+                await db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == "running", Job.attempts == attempt)
+                    .values(started_at=datetime.utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+        except Exception:
+            logger.exception("Could not refresh the heartbeat of job %s", job_id)
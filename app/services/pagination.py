@@ -0,0 +1,41 @@
+"""Keyset (cursor) pagination helpers for time-ordered listings."""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Select, tuple_
+
+
+def encode_cursor(timestamp: datetime, row_id: uuid.UUID) -> str:
+    """Opaque token for the position after (timestamp, row_id)."""
+    payload = json.dumps([timestamp.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse of encode_cursor. Raises ValueError on a malformed token."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), uuid.UUID(row_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_page(query: Select, time_column, id_column, cursor: str | None, limit: int) -> Select:
+    """Order newest-first by (time_column, id_column) and start after ``cursor`` if given."""
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        # Row comparison matches the (time, id) composite index directly
+        query = query.where(tuple_(time_column, id_column) < tuple_(timestamp, row_id))
+    return query.order_by(time_column.desc(), id_column.desc()).limit(limit)
+
+
+def next_cursor(rows: list, limit: int, time_attr: str) -> str | None:
+    """Cursor for the next page, or None when this page is the last one."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(getattr(last, time_attr), last.id)
@@ -1,7 +1,31 @@
 """PDF text extraction service using pdfplumber."""
 
+import asyncio
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import pdfplumber
 
+from app.config import settings
+from app.metrics import PDF_EXTRACTION_QUEUE
+
+logger = logging.getLogger(__name__)
+
+_PAGE_MARKER = re.compile(r"^--- Page (\d+) ---\n", re.MULTILINE)
+
+_executor: ProcessPoolExecutor | None = None
+_semaphore: asyncio.Semaphore | None = None
+_waiting = 0
+_running = 0
+
+
+def extract_pages_from_pdf(file_path: str) -> list[tuple[int, str | None]]:
+    """Extract every page of a PDF as (page_number, text) pairs; text may be empty or None."""
+    with pdfplumber.open(file_path) as pdf:
+        return [(i + 1, page.extract_text()) for i, page in enumerate(pdf.pages)]
+
 
 def extract_text_from_pdf(file_path: str) -> tuple[str, int]:
     """Extract text from a PDF file.
@@ -9,13 +33,153 @@ def extract_text_from_pdf(file_path: str) -> tuple[str, int]:
     Returns:
         Tuple of (extracted_text, page_count)
     """
-    pages_text = []
+    pages = extract_pages_from_pdf(file_path)
+    return join_pages(pages), len(pages)
+
+
+def _extract_page_range(file_path: str, start: int, end: int) -> list[tuple[int, str | None]]:
+    """Extract pages [start, end) (0-based) as (page_number, text) pairs.
+
+    Each call opens the file itself so it can run in its own worker process.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        return [(i + 1, pdf.pages[i].extract_text()) for i in range(start, end)]
+
+
+def _extract_if_short(file_path: str, min_parallel_pages: int) -> tuple[int, list[tuple[int, str | None]] | None]:
+    """Return (page_count, pages), or (page_count, None) if the PDF is long enough to split.
+
+    Short documents, the common case, are parsed with this one open.
+    """
     with pdfplumber.open(file_path) as pdf:
         page_count = len(pdf.pages)
-        for i, page in enumerate(pdf.pages):
-            text = page.extract_text()
-            if text:
-                pages_text.append(f"--- Page {i + 1} ---\n{text}")
+        if page_count >= min_parallel_pages:
+            return page_count, None
+        return page_count, [(i + 1, page.extract_text()) for i, page in enumerate(pdf.pages)]
+
+
+def join_pages(pages: list[tuple[int, str | None]]) -> str:
+    """Join (page_number, text) pairs with "--- Page N ---" markers, skipping empty pages."""
+    return "\n\n".join(f"--- Page {number} ---\n{text}" for number, text in pages if text)
+
+
+def page_offsets(text: str) -> list[list[int]]:
+    """Locate each page's text within output of ``join_pages``.
+
+    Returns [page_number, start, end] character offsets (end exclusive).
+    """
+    markers = list(_PAGE_MARKER.finditer(text))
+    offsets = []
+    for i, marker in enumerate(markers):
+        # Pages are separated by a blank line before the next marker
+        end = markers[i + 1].start() - 2 if i + 1 < len(markers) else len(text)
+        offsets.append([int(marker.group(1)), marker.end(), end])
+    return offsets
+
+
+def _page_ranges(page_count: int, parts: int) -> list[tuple[int, int]]:
+    size = -(-page_count // parts)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def _warm_worker() -> None:
+    """Pre-import pdfminer's heavy modules so the first parse in each worker is not slowed by imports."""
+    import pdfminer.converter  # noqa: F401
+    import pdfminer.layout  # noqa: F401
+    import pdfminer.pdfinterp  # noqa: F401
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PDF_EXTRACT_WORKERS,
+            initializer=_warm_worker,
+        )
+    return _executor
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.PDF_EXTRACT_MAX_CONCURRENCY)
+    return _semaphore
+
+
+async def extract_pages_from_pdf_async(file_path: str) -> list[tuple[int, str | None]]:
+    """Run PDF extraction in the process pool without blocking the event loop.
+
+    At most PDF_EXTRACT_MAX_CONCURRENCY documents are parsed at once; further
+    callers wait. Documents with at least PDF_PARALLEL_MIN_PAGES pages are split
+    into page ranges extracted concurrently across the pool.
+    """
+    global _waiting, _running
+    semaphore = _get_semaphore()
+    _waiting += 1
+    PDF_EXTRACTION_QUEUE.labels(state="waiting").inc()
+    try:
+        await semaphore.acquire()
+    finally:
+        _waiting -= 1
+        PDF_EXTRACTION_QUEUE.labels(state="waiting").dec()
+
+    _running += 1
+    PDF_EXTRACTION_QUEUE.labels(state="running").inc()
+    try:
+        executor = _get_executor()
+        try:
+            return await _extract_in_pool(file_path, executor)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a large scan) and took the pool with it;
+            # replace the pool so later extractions work, and retry this one once
+            logger.warning("PDF extraction pool broke while parsing %s; recreating it", file_path)
+            _discard_executor(executor)
+            return await _extract_in_pool(file_path, _get_executor())
+    finally:
+        _running -= 1
+        PDF_EXTRACTION_QUEUE.labels(state="running").dec()
+        semaphore.release()
+
+
+async def _extract_in_pool(file_path: str, executor: ProcessPoolExecutor) -> list[tuple[int, str | None]]:
+    loop = asyncio.get_running_loop()
+    if settings.PDF_PARALLEL_MIN_PAGES <= 0:
+        return await loop.run_in_executor(executor, extract_pages_from_pdf, file_path)
+
+    page_count, pages = await loop.run_in_executor(
+        executor, _extract_if_short, file_path, settings.PDF_PARALLEL_MIN_PAGES
+    )
+    if pages is not None:
+        return pages
+    return await _extract_pages_parallel(file_path, page_count, executor)
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    global _executor
+    # Concurrent callers may have already replaced it
+    if _executor is executor:
+        _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _extract_pages_parallel(
+    file_path: str, page_count: int, executor: ProcessPoolExecutor
+) -> list[tuple[int, str | None]]:
+    loop = asyncio.get_running_loop()
+    ranges = _page_ranges(page_count, settings.PDF_EXTRACT_WORKERS)
+    chunks = await asyncio.gather(
+        *(loop.run_in_executor(executor, _extract_page_range, file_path, start, end) for start, end in ranges)
+    )
+    return [page for chunk in chunks for page in chunk]
+
+
+def extraction_queue_depth() -> dict[str, int]:
+    """Number of parses waiting for a slot and currently running."""
+    return {"waiting": _waiting, "running": _running}
+
 
-    full_text = "\n\n".join(pages_text)
-    return full_text, page_count
+def shutdown_extraction_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,99 @@
+"""Concurrency + tokens-per-minute limiter for outbound LLM calls."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+
+class RateLimiter:
+    """Caps in-flight requests with a semaphore and token throughput with a token bucket.
+
+    The bucket holds up to ``tokens_per_minute`` tokens and refills continuously.
+    Callers reserve an estimate up front and settle against actual usage once
+    the response arrives. Limits are per process.
+    """
+
+    def __init__(self, max_in_flight: int, tokens_per_minute: int):
+        self.max_in_flight = max_in_flight
+        self.tokens_per_minute = tokens_per_minute
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._bucket_lock = asyncio.Lock()
+        self._available = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._waiting = 0
+        self._requests = 0
+        self._throttled = 0
+        self._wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int):
+        """Wait for a request slot and ``tokens`` of budget, then hold the slot."""
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self._take_tokens(tokens)
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - started
+        self._wait_seconds += waited
+        self._requests += 1
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def settle(self, reserved: int, actual: int) -> None:
+        """Refund (or charge) the difference between a reservation and actual usage."""
+        if self.tokens_per_minute <= 0:
+            return
+        self._refill()
+        self._available = min(self._available + reserved - actual, float(self.tokens_per_minute))
+
+    def stats(self) -> dict:
+        self._refill()
+        return {
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "max_in_flight": self.max_in_flight,
+            "tokens_per_minute": self.tokens_per_minute,
+            "available_tokens": int(self._available),
+            "requests_total": self._requests,
+            "throttled_total": self._throttled,
+            "wait_seconds_total": round(self._wait_seconds, 3),
+        }
+
+    async def _take_tokens(self, tokens: int) -> None:
+        if self.tokens_per_minute <= 0:
+            return
+        # A single request larger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self._bucket_lock:
+            throttled = False
+            while True:
+                self._refill()
+                if self._available >= tokens:
+                    self._available -= tokens
+                    return
+                if not throttled:
+                    throttled = True
+                    self._throttled += 1
+                deficit = tokens - self._available
+                await asyncio.sleep(deficit * 60.0 / self.tokens_per_minute)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._available = min(
+            self._available + elapsed * self.tokens_per_minute / 60.0,
+            float(self.tokens_per_minute),
+        )
@@ -0,0 +1,45 @@
+"""Patient / provider name search for billing notes (pg_trgm backed)."""
+
+from sqlalchemy import Select, func, or_
+
+from app.config import settings
+from app.models.billing_note import BillingNote
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def is_ranked_search(search: str) -> bool:
+    """Terms long enough to form trigrams are ranked by similarity; shorter ones use the prefix path."""
+    return len(search.strip()) >= settings.SEARCH_TRIGRAM_MIN_LENGTH
+
+
+def apply_note_search(query: Select, search: str) -> Select:
+    """Filter ``query`` to notes whose patient or provider name matches ``search``.
+
+    Short terms match name prefixes via the lower() pattern indexes and keep the
+    caller's ordering. Longer terms match substrings via the trigram GIN indexes
+    and are ordered by similarity (best first); the caller adds any tiebreakers.
+    """
+    term = search.strip()
+    if not is_ranked_search(term):
+        prefix = escape_like(term.lower()) + "%"
+        return query.where(
+            or_(
+                func.lower(BillingNote.patient_name).like(prefix),
+                func.lower(BillingNote.provider_name).like(prefix),
+            )
+        )
+
+    pattern = f"%{escape_like(term)}%"
+    rank = func.greatest(
+        func.coalesce(func.similarity(BillingNote.patient_name, term), 0),
+        func.coalesce(func.similarity(BillingNote.provider_name, term), 0),
+    )
+    return query.where(
+        or_(
+            BillingNote.patient_name.ilike(pattern),
+            BillingNote.provider_name.ilike(pattern),
+        )
+    ).order_by(rank.desc())
@@ -0,0 +1,77 @@
+"""Dashboard statistics: exact aggregate query or incrementally maintained counters."""
+
+from sqlalchemy import Select, select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.billing_note import BillingNote
+from app.models.billing_note_stats import BillingNoteStats
+from app.models.document import Document
+
+STATUSES = ("draft", "reviewed", "finalized")
+
+
+def exact_stats_query() -> Select:
+    return select(
+        func.count(BillingNote.id),
+        *(func.count(BillingNote.id).filter(BillingNote.status == status) for status in STATUSES),
+        select(func.count(Document.id)).scalar_subquery(),
+    )
+
+
+async def get_exact_stats(db: AsyncSession) -> dict:
+    """Count everything in a single aggregate query."""
+    result = await db.execute(exact_stats_query())
+    total, *by_status, documents = result.one()
+    return _stats_response(total, dict(zip(STATUSES, by_status)), documents)
+
+
+async def get_counter_stats(db: AsyncSession) -> dict:
+    """Read the billing_note_stats counters (one indexed read, independent of table size)."""
+    result = await db.execute(select(BillingNoteStats.bucket, BillingNoteStats.count))
+    counts = dict(result.all())
+    return _stats_response(counts.get("total", 0), counts, counts.get("documents", 0))
+
+
+async def adjust_stats(db: AsyncSession, deltas: dict[str, int]) -> None:
+    """Apply counter deltas in the caller's transaction. No-op unless BILLING_STATS_USE_COUNTERS is set."""
+    if not settings.BILLING_STATS_USE_COUNTERS:
+        return
+    # Sorted so concurrent transactions lock counter rows in the same order
+    rows = [{"bucket": bucket, "count": delta} for bucket, delta in sorted(deltas.items()) if delta]
+    if not rows:
+        return
+    stmt = insert(BillingNoteStats).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BillingNoteStats.bucket],
+        set_={"count": BillingNoteStats.count + stmt.excluded.count},
+    )
+    await db.execute(stmt)
+
+
+async def note_created(db: AsyncSession, status: str) -> None:
+    await adjust_stats(db, {"total": 1, status: 1})
+
+
+async def note_status_changed(db: AsyncSession, old_status: str, new_status: str) -> None:
+    if old_status != new_status:
+        await adjust_stats(db, {old_status: -1, new_status: 1})
+
+
+async def note_deleted(db: AsyncSession, status: str) -> None:
+    await adjust_stats(db, {"total": -1, status: -1})
+
+
+async def documents_created(db: AsyncSession, count: int = 1) -> None:
+    await adjust_stats(db, {"documents": count})
+
+
+def _stats_response(total: int, by_status: dict, documents: int) -> dict:
+    return {
+        "total_notes": total or 0,
+        "draft": by_status.get("draft") or 0,
+        "reviewed": by_status.get("reviewed") or 0,
+        "finalized": by_status.get("finalized") or 0,
+        "total_documents": documents or 0,
+    }
@@ -0,0 +1,157 @@
+"""Supabase Storage helpers for uploaded PDFs.
+
+Talks to the Storage REST API through one process-wide ``httpx.AsyncClient``
+(pooled keep-alive connections, STORAGE_* limits and timeouts), so storage
+I/O never blocks the event loop. Files are streamed to and from disk.
+
+With STORAGE_BACKEND="local" objects are kept under LOCAL_STORAGE_DIR instead
+(benchmarks and offline development).
+"""
+
+import asyncio
+import os
+import shutil
+from typing import BinaryIO
+
+import aiofiles
+import httpx
+
+from app.config import settings
+
+_client: httpx.AsyncClient | None = None
+
+
+def init_storage_client() -> httpx.AsyncClient:
+    """Create the process-wide storage client (called from the app lifespan / worker start)."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=f"{settings.SUPABASE_URL}/storage/v1",
+            headers={
+                "Authorization": f"Bearer {settings.SUPABASE_SERVICE_KEY}",
+                "apikey": settings.SUPABASE_SERVICE_KEY,
+            },
+            timeout=httpx.Timeout(
+                settings.STORAGE_TIMEOUT_SECONDS, connect=settings.STORAGE_CONNECT_TIMEOUT_SECONDS
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.STORAGE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.STORAGE_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _client
+
+
+async def close_storage_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def is_storage_path(file_path: str) -> bool:
+    """New uploads store the Supabase object path ("pdfs/..."), old ones a local disk path."""
+    return file_path.startswith("pdfs/")
+
+
+def _object_url(storage_path: str) -> str:
+    return f"/object/{settings.SUPABASE_STORAGE_BUCKET}/{storage_path}"
+
+
+async def upload_pdf(storage_path: str, local_path: str) -> None:
+    """Upload a local PDF file to the storage bucket, streaming it from disk."""
+    with open(local_path, "rb") as f:
+        await upload_pdf_file(storage_path, f)
+
+
+async def upload_pdf_file(storage_path: str, file: BinaryIO) -> None:
+    """Upload an open binary file from its current position, e.g. an upload's spooled ``file``."""
+    if settings.STORAGE_BACKEND == "local":
+        await asyncio.to_thread(_copy_local_file, file, _local_object_path(storage_path))
+        return
+
+    start = file.tell()
+    size = file.seek(0, os.SEEK_END) - start
+    file.seek(start)
+
+    async def chunks():
+        while chunk := await asyncio.to_thread(file.read, settings.UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+    response = await init_storage_client().post(
+        _object_url(storage_path),
+        content=chunks(),
+        headers={
+            "Content-Type": "application/pdf",
+            "Content-Length": str(size),
+            "x-upsert": "false",
+        },
+    )
+    response.raise_for_status()
+
+
+async def download_pdf_to(storage_path: str, dest_path: str) -> int:
+    """Stream a stored PDF to ``dest_path``; returns the number of bytes written."""
+    if settings.STORAGE_BACKEND == "local":
+        await asyncio.to_thread(_copy_local, _local_object_path(storage_path), dest_path)
+        return os.path.getsize(dest_path)
+
+    size = 0
+    async with init_storage_client().stream("GET", _object_url(storage_path)) as response:
+        response.raise_for_status()
+        async with aiofiles.open(dest_path, "wb") as out:
+            async for chunk in response.aiter_bytes(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                await out.write(chunk)
+    return size
+
+
+async def open_pdf_stream(storage_path: str, range_header: str | None = None) -> httpx.Response:
+    """Start a streaming GET for a stored PDF, forwarding an HTTP Range header.
+
+    The body is requested uncompressed so it matches the upstream Content-Length
+    and Content-Range. The caller reads it with ``aiter_raw()`` and must
+    ``aclose()`` the response.
+    """
+    client = init_storage_client()
+    headers = {"Accept-Encoding": "identity"}
+    if range_header:
+        headers["Range"] = range_header
+    request = client.build_request("GET", _object_url(storage_path), headers=headers)
+    return await client.send(request, stream=True)
+
+
+async def create_signed_url(storage_path: str, expires_in: int) -> str:
+    """Return a URL that serves the object without auth for ``expires_in`` seconds."""
+    response = await init_storage_client().post(
+        f"/object/sign/{settings.SUPABASE_STORAGE_BUCKET}/{storage_path}",
+        json={"expiresIn": expires_in},
+    )
+    response.raise_for_status()
+    return f"{settings.SUPABASE_URL}/storage/v1{response.json()['signedURL']}"
+
+
+def local_pdf_path(storage_path: str) -> str | None:
+    """Disk path of a stored object when STORAGE_BACKEND is "local", otherwise None."""
+    if settings.STORAGE_BACKEND != "local":
+        return None
+    return _local_object_path(storage_path)
+
+
+def _copy_local(src: str, dest: str) -> None:
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    shutil.copyfile(src, dest)
+
+
+def _copy_local_file(src: BinaryIO, dest: str) -> None:
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    with open(dest, "wb") as out:
+        shutil.copyfileobj(src, out)
+
+
+def _local_object_path(storage_path: str) -> str:
+    root = os.path.abspath(settings.LOCAL_STORAGE_DIR)
+    path = os.path.abspath(os.path.join(root, storage_path))
+    if not path.startswith(root + os.sep):
+        raise ValueError(f"Invalid storage path: {storage_path}")
+    return path
@@ -0,0 +1,36 @@
+"""Per-stage timing spans for the document pipeline."""
+
+import time
+from contextlib import contextmanager
+
+from app.metrics import PIPELINE_STAGE_SECONDS
+
+
+class StageTimer:
+    """Collects named stage spans as JSON-ready dicts and feeds the stage histogram.
+
+    Each span records ``name`` and ``ms``; callers may add attributes (token or
+    page counts) to the dict yielded by ``stage()``.
+    """
+
+    def __init__(self):
+        self.stages: list[dict] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        span: dict = {"name": name}
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span["failed"] = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            span["ms"] = round(elapsed * 1000, 1)
+            self.stages.append(span)
+            PIPELINE_STAGE_SECONDS.labels(stage=name).observe(elapsed)
+
+    def total_ms(self) -> int:
+        return int((time.perf_counter() - self._started) * 1000)
@@ -0,0 +1,138 @@
+"""Streaming upload handling: hash request bodies and spool ZIP entries in fixed-size chunks."""
+
+import hashlib
+import os
+import uuid
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO
+
+import aiofiles
+from fastapi import UploadFile
+
+from app.config import settings
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class NotAPdf(Exception):
+    pass
+
+
+@dataclass
+class SpooledFile:
+    filename: str
+    path: str | None = None
+    file: BinaryIO | None = None  # an upload's own spooled file, used instead of ``path``
+    sha256: str | None = None
+    size: int = 0
+    error: str | None = None
+
+
+def new_spool_path() -> str:
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    return os.path.join(settings.UPLOAD_DIR, f"spool_{uuid.uuid4()}.pdf")
+
+
+async def hash_upload(file: UploadFile) -> tuple[str, int]:
+    """Hash an upload UPLOAD_CHUNK_SIZE bytes at a time, then rewind it.
+
+    Starlette already spools the body to a temporary file, so it is read in
+    place (``file.file``) rather than copied again.
+
+    Returns:
+        Tuple of (sha256 hex digest, size in bytes)
+
+    Raises:
+        UploadTooLarge: if the body exceeds UPLOAD_MAX_BYTES.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > settings.UPLOAD_MAX_BYTES:
+            raise UploadTooLarge(f"File exceeds {settings.UPLOAD_MAX_BYTES} bytes")
+        digest.update(chunk)
+    await file.seek(0)
+    return digest.hexdigest(), size
+
+
+def remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def spool_zip_entries(zip_file: str | BinaryIO, max_files: int) -> list[SpooledFile]:
+    """Stream each PDF entry of a ZIP archive to its own spool file, hashing as it goes.
+
+    Blocking; run it in a thread. Entries that are not PDFs (by name or by the
+    ``%PDF`` header), are over
+    UPLOAD_MAX_BYTES, exceed ``max_files`` or cannot be read (encrypted,
+    unsupported compression, corrupt data) come back with ``error`` set. If
+    anything else goes wrong, spool files already written are removed.
+    """
+    spooled: list[SpooledFile] = []
+    accepted = 0
+    try:
+        with zipfile.ZipFile(zip_file) as archive:
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                    continue
+                if not name.lower().endswith(".pdf"):
+                    spooled.append(SpooledFile(filename=name, error="Only PDF files are accepted"))
+                    continue
+                if accepted >= max_files:
+                    spooled.append(SpooledFile(filename=name, error=f"Batch is limited to {max_files} files"))
+                    continue
+                if info.file_size > settings.UPLOAD_MAX_BYTES:
+                    spooled.append(
+                        SpooledFile(filename=name, error=f"File exceeds {settings.UPLOAD_MAX_BYTES} bytes")
+                    )
+                    continue
+
+                dest_path = new_spool_path()
+                try:
+                    sha256, size = _copy_zip_entry(archive, info, dest_path)
+                except (UploadTooLarge, NotAPdf) as e:
+                    spooled.append(SpooledFile(filename=name, error=str(e)))
+                    continue
+                except (RuntimeError, NotImplementedError, zipfile.BadZipFile, zlib.error, EOFError) as e:
+                    spooled.append(SpooledFile(filename=name, error=f"Could not read file from ZIP: {e}"))
+                    continue
+                accepted += 1
+                spooled.append(SpooledFile(filename=name, path=dest_path, sha256=sha256, size=size))
+    except BaseException:
+        for f in spooled:
+            if f.path:
+                remove_quietly(f.path)
+        raise
+    return spooled
+
+
+def _copy_zip_entry(archive: zipfile.ZipFile, info: zipfile.ZipInfo, dest_path: str) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with archive.open(info) as src, open(dest_path, "wb") as out:
+            while chunk := src.read(settings.UPLOAD_CHUNK_SIZE):
+                # The extension is only a name; the spec allows junk before the header within 1 KiB
+                if size == 0 and b"%PDF-" not in chunk[:1024]:
+                    raise NotAPdf("File is not a PDF")
+                size += len(chunk)
+                # The declared size in the ZIP header can lie; enforce on actual bytes
+                if size > settings.UPLOAD_MAX_BYTES:
+                    raise UploadTooLarge(f"File exceeds {settings.UPLOAD_MAX_BYTES} bytes")
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise NotAPdf("File is not a PDF")
+    except BaseException:
+        remove_quietly(dest_path)
+        raise
+    return digest.hexdigest(), size
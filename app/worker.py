@@ -0,0 +1,58 @@
+"""Extraction worker: drains the jobs table.
+
+Run with ``python -m app.worker``. Several workers can run side by side;
+``FOR UPDATE SKIP LOCKED`` keeps them from claiming the same job.
+"""
+
+import asyncio
+import logging
+
+from prometheus_client import start_http_server
+
+from app.config import settings
+from app.database import async_session
+from app.metrics import mark_process_dead
+from app.services.claude_service import init_client, close_client
+from app.services.code_index import get_code_index
+from app.services.job_service import claim_next_job, run_job
+from app.services.pdf_service import shutdown_extraction_executor
+from app.services.storage_service import init_storage_client, close_storage_client
+
+logger = logging.getLogger("app.worker")
+
+
+async def run_worker() -> None:
+    logger.info("Extraction worker started")
+    init_client()
+    init_storage_client()
+    try:
+        async with async_session() as db:
+            index = await get_code_index(db)
+            logger.info("Loaded code index v%d (%d CPT, %d ICD-10)", index.version, len(index.cpt), len(index.icd10))
+        while True:
+            async with async_session() as db:
+                job = await claim_next_job(db)
+                if job:
+                    logger.info("Running job %s for document %s", job.id, job.document_id)
+                    await run_job(db, job)
+                    continue
+            await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+    finally:
+        await close_client()
+        await close_storage_client()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if settings.WORKER_METRICS_PORT:
+        # Pipeline, LLM and PDF-queue metrics recorded in this process
+        start_http_server(settings.WORKER_METRICS_PORT)
+    try:
+        asyncio.run(run_worker())
+    finally:
+        shutdown_extraction_executor()
+        mark_process_dead()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Synthetic clinical-note PDF corpus for benchmarks.
+
+Writes minimal, valid text PDFs (Helvetica, one content stream per page) with
+no dependencies beyond the standard library. Every document gets a unique
+seed so content hashes and extraction-cache keys differ.
+
+    python -m benchmarks.corpus out_dir --docs 50 --pages 1-40
+"""
+
+import argparse
+import random
+from pathlib import Path
+
+SECTIONS = [
+    "CHIEF COMPLAINT: {complaint}.",
+    "HISTORY OF PRESENT ILLNESS: {age}-year-old patient with {condition} presents for follow-up.",
+    "Reports {frequency} episodes over the past month; last episode {days} days ago.",
+    "NEUROLOGICAL EXAM: Alert and oriented. Cranial nerves II-XII intact. Strength 5/5 throughout.",
+    "Reflexes 2+ and symmetric. Sensation intact to light touch. Gait steady.",
+    "PROCEDURE: {procedure} performed and interpreted.",
+    "FINDINGS: {finding}.",
+    "ASSESSMENT: {condition}, {control}.",
+    "PLAN: Continue {medication}; return in {weeks} weeks. Total time {minutes} minutes.",
+]
+COMPLAINTS = ["recurrent seizures", "daily headaches", "numbness in both feet", "tremor", "excessive daytime sleepiness"]
+CONDITIONS = ["focal epilepsy", "chronic migraine", "peripheral neuropathy", "Parkinson disease", "obstructive sleep apnea"]
+PROCEDURES = ["Routine EEG, awake and drowsy", "Nerve conduction study, 6 studies", "Polysomnography with CPAP titration",
+              "Needle EMG, one extremity", "Chemodenervation for chronic migraine"]
+FINDINGS = ["left temporal sharp waves", "length-dependent axonal sensorimotor neuropathy", "AHI of 31 events per hour",
+            "no epileptiform discharges", "reduced sural sensory amplitudes bilaterally"]
+MEDICATIONS = ["levetiracetam 750 mg BID", "topiramate 50 mg nightly", "gabapentin 300 mg TID",
+               "carbidopa-levodopa 25/100 TID", "CPAP at 9 cm H2O"]
+
+
+def _escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_lines(rng: random.Random, page_number: int) -> list[str]:
+    lines = [f"NEUROLOGY CLINIC NOTE - page {page_number}", f"Patient: Test Patient {rng.randint(1000, 999999)}"]
+    for _ in range(3):
+        for template in SECTIONS:
+            lines.append(
+                template.format(
+                    complaint=rng.choice(COMPLAINTS),
+                    age=rng.randint(18, 90),
+                    condition=rng.choice(CONDITIONS),
+                    frequency=rng.randint(1, 20),
+                    days=rng.randint(1, 30),
+                    procedure=rng.choice(PROCEDURES),
+                    finding=rng.choice(FINDINGS),
+                    control=rng.choice(["well controlled", "not intractable", "worsening"]),
+                    medication=rng.choice(MEDICATIONS),
+                    weeks=rng.choice([4, 6, 8, 12]),
+                    minutes=rng.randint(20, 60),
+                )
+            )
+    return lines
+
+
+def build_pdf(pages: list[list[str]]) -> bytes:
+    """Assemble a PDF with one page per list of text lines."""
+    objects: list[bytes] = []
+    page_ids = []
+    font_id = 3
+    next_id = 4
+    for lines in pages:
+        text = "\n".join(f"({_escape(line)}) '" for line in lines)
+        stream = f"BT /F1 9 Tf 40 800 Td 12 TL\n{text}\nET".encode("latin-1")
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        objects.append(
+            f"{content_id} 0 obj\n<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream\nendobj\n"
+        )
+        objects.append(
+            f"{page_id} 0 obj\n<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>\nendobj\n".encode()
+        )
+        page_ids.append(page_id)
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    head = [
+        b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n",
+        f"2 0 obj\n<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>\nendobj\n".encode(),
+        b"3 0 obj\n<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>\nendobj\n",
+    ]
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for obj in head + objects:
+        offsets.append(len(out))
+        out += obj
+    xref_at = len(out)
+    out += f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def generate_corpus(out_dir: Path, docs: int, min_pages: int, max_pages: int, seed: int = 0) -> list[Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(docs):
+        rng = random.Random(seed * 1_000_003 + i)
+        page_count = rng.randint(min_pages, max_pages)
+        path = out_dir / f"note_{seed}_{i:04d}.pdf"
+        path.write_bytes(build_pdf([_page_lines(rng, n + 1) for n in range(page_count)]))
+        paths.append(path)
+    return paths
+
+
+def parse_range(value: str) -> tuple[int, int]:
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--docs", type=int, default=50)
+    parser.add_argument("--pages", type=parse_range, default=(1, 10), help="page count range, e.g. 1-40")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    paths = generate_corpus(args.out_dir, args.docs, *args.pages, seed=args.seed)
+    print(f"wrote {len(paths)} PDFs to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
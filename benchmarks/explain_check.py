@@ -0,0 +1,165 @@
+"""Fail if the listing and lookup queries stop using their supporting indexes.
+
+Runs EXPLAIN for the queries behind the billing note and document listings,
+the dashboard stats and the extracted code/diagnosis loads, and checks that
+each plan uses the index added for it. Plans are only meaningful on realistic
+data, so seed a scratch database first (skewed statuses: most notes are
+finalized, few are drafts) and let the planner choose freely. Exits 1 if any
+query is planned without its index, so it can gate CI or a migration:
+
+    DATABASE_URL=postgresql+asyncpg://.../medbill_bench python -m benchmarks.explain_check --seed
+    python -m benchmarks.explain_check
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Select, select, text
+
+from app.database import async_session, engine
+from app.models.billing_note import BillingNote
+from app.models.document import Document
+from app.models.extracted_code import ExtractedCode
+from app.models.extracted_diagnosis import ExtractedDiagnosis
+from app.services.pagination import encode_cursor, keyset_page
+from app.services.stats_service import exact_stats_query
+
+SEED_SQL = [
+    """
+    INSERT INTO documents (id, filename, file_path, uploaded_at)
+    SELECT gen_random_uuid(), 'explain_' || g || '.pdf', 'pdfs/explain_' || g || '.pdf',
+           now() - (g || ' seconds')::interval
+    FROM generate_series(1, CAST(:rows AS integer)) AS g
+    """,
+    """
+    INSERT INTO billing_notes (id, document_id, patient_name, provider_name, clinical_summary, status,
+                               created_at, updated_at)
+    SELECT gen_random_uuid(), d.id, 'Patient ' || d.rn, 'Dr. Provider', repeat('Clinical summary. ', 20),
+           CASE WHEN d.rn % 50 = 0 THEN 'draft' WHEN d.rn % 10 = 0 THEN 'reviewed' ELSE 'finalized' END,
+           d.uploaded_at, now()
+    FROM (
+        SELECT id, uploaded_at, row_number() OVER () AS rn FROM documents WHERE filename LIKE 'explain\\_%'
+    ) AS d
+    """,
+    """
+    INSERT INTO extracted_codes (id, billing_note_id, cpt_code_raw, description, confidence, confirmed)
+    SELECT gen_random_uuid(), n.id, '9581' || g, 'Routine EEG', 0.9, false
+    FROM billing_notes AS n, generate_series(1, 3) AS g
+    """,
+    """
+    INSERT INTO extracted_diagnoses (id, billing_note_id, icd10_code_raw, description, confidence, is_primary)
+    SELECT gen_random_uuid(), n.id, 'G40.30' || g, 'Generalized epilepsy', 0.9, g = 1
+    FROM billing_notes AS n, generate_series(1, 2) AS g
+    """,
+]
+
+ANALYZED_TABLES = ("documents", "billing_notes", "extracted_codes", "extracted_diagnoses")
+
+
+async def seed(rows: int) -> None:
+    async with async_session() as db:
+        for statement in SEED_SQL:
+            await db.execute(text(statement), {"rows": rows})
+        await db.commit()
+    # VACUUM cannot run in a transaction; it also sets the visibility map for index-only scans
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in ANALYZED_TABLES:
+            await conn.execute(text(f"VACUUM ANALYZE {table}"))
+    print(f"seeded {rows} documents and billing notes")
+
+
+def _checks() -> list[tuple[str, Select, str]]:
+    """(name, query, index the plan must use)."""
+    cursor = encode_cursor(datetime.utcnow(), uuid.uuid4())
+    note_ids = [uuid.uuid4(), uuid.uuid4()]
+    drafts = select(BillingNote).where(BillingNote.status == "draft")
+    return [
+        (
+            "billing notes by status",
+            keyset_page(drafts, BillingNote.created_at, BillingNote.id, None, 50),
+            "ix_billing_notes_status_created_at_id",
+        ),
+        (
+            "billing notes by status, next page",
+            keyset_page(drafts, BillingNote.created_at, BillingNote.id, cursor, 50),
+            "ix_billing_notes_status_created_at_id",
+        ),
+        ("billing stats (exact)", exact_stats_query(), "ix_billing_notes_status_created_at_id"),
+        (
+            "extracted codes for notes",
+            select(ExtractedCode).where(ExtractedCode.billing_note_id.in_(note_ids)),
+            "ix_extracted_codes_billing_note_id",
+        ),
+        (
+            "extracted diagnoses for notes",
+            select(ExtractedDiagnosis).where(ExtractedDiagnosis.billing_note_id.in_(note_ids)),
+            "ix_extracted_diagnoses_billing_note_id",
+        ),
+        (
+            "documents page",
+            keyset_page(select(Document), Document.uploaded_at, Document.id, None, 50),
+            "ix_documents_uploaded_at_id",
+        ),
+        (
+            "documents next page",
+            keyset_page(select(Document), Document.uploaded_at, Document.id, cursor, 50),
+            "ix_documents_uploaded_at_id",
+        ),
+    ]
+
+
+def _plan_nodes(plan: dict) -> list[str]:
+    """Flatten a JSON plan into "Node Type [on relation] [using index]" strings."""
+    node = plan["Node Type"]
+    if "Relation Name" in plan:
+        node += f" on {plan['Relation Name']}"
+    if "Index Name" in plan:
+        node += f" using {plan['Index Name']}"
+    nodes = [node]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+async def run() -> int:
+    failures = 0
+    async with async_session() as db:
+        for name, query, index in _checks():
+            sql = query.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+            result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            plan = result.scalar_one()
+            if isinstance(plan, str):  # asyncpg hands json columns back undecoded
+                plan = json.loads(plan)
+            nodes = _plan_nodes(plan[0]["Plan"])
+            if any(node.endswith(f"using {index}") for node in nodes):
+                print(f"ok    {name}")
+            else:
+                failures += 1
+                print(f"FAIL  {name}: expected {index}, plan: {' -> '.join(nodes)}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="insert synthetic rows and ANALYZE before checking")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    async def _main() -> int:
+        try:
+            if args.seed:
+                await seed(args.rows)
+            return await run()
+        finally:
+            await engine.dispose()
+
+    sys.exit(1 if asyncio.run(_main()) else 0)
+
+
+if __name__ == "__main__":
+    main()
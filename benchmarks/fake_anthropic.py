@@ -0,0 +1,85 @@
+"""Local stand-in for the Anthropic Messages API.
+
+Replays recorded ``submit_extraction`` tool inputs (round-robin) as tool_use
+responses after a configurable delay, so the pipeline can be driven without
+API credits. Point the app at it with ANTHROPIC_BASE_URL=http://127.0.0.1:<port>.
+
+    python -m benchmarks.fake_anthropic --port 8765 --latency 2.0 --jitter 0.5
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+DEFAULT_RESPONSES = Path(__file__).resolve().parent / "fixtures" / "extraction_responses.json"
+
+
+def create_app(responses_path: Path = DEFAULT_RESPONSES, latency: float = 1.0, jitter: float = 0.0) -> FastAPI:
+    recorded = json.loads(Path(responses_path).read_text())
+    cycle = itertools.cycle(recorded)
+    app = FastAPI()
+
+    @app.post("/v1/messages")
+    async def create_message(request: Request):
+        body = await request.json()
+        tool_input = next(cycle)
+        await asyncio.sleep(max(0.0, random.gauss(latency, jitter)))
+
+        # The static prefix counts as a cache read after the first call, like the real API
+        prompt_chars = len(json.dumps(body.get("system", ""))) + len(json.dumps(body.get("tools", [])))
+        message_chars = len(json.dumps(body.get("messages", [])))
+        first_call = not app.state.seen_prefix
+        app.state.seen_prefix = True
+        return {
+            "id": f"msg_bench_{time.monotonic_ns()}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake"),
+            "content": [
+                {"type": "tool_use", "id": "toolu_bench", "name": "submit_extraction", "input": tool_input}
+            ],
+            "stop_reason": "tool_use",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": message_chars // 4,
+                "output_tokens": len(json.dumps(tool_input)) // 4,
+                "cache_creation_input_tokens": prompt_chars // 4 if first_call else 0,
+                "cache_read_input_tokens": 0 if first_call else prompt_chars // 4,
+            },
+        }
+
+    app.state.seen_prefix = False
+    return app
+
+
+def serve_in_thread(port: int, **kwargs) -> uvicorn.Server:
+    """Start the fake server on a background thread; returns once it accepts connections."""
+    server = uvicorn.Server(uvicorn.Config(create_app(**kwargs), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="mean response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="standard deviation of the delay")
+    parser.add_argument("--responses", type=Path, default=DEFAULT_RESPONSES)
+    args = parser.parse_args()
+    app = create_app(args.responses, args.latency, args.jitter)
+    uvicorn.run(app, host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
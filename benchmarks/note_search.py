@@ -0,0 +1,111 @@
+"""Latency of billing note name search against a large seeded table.
+
+Seeds synthetic billing notes (default 1,000,000) into the configured
+DATABASE_URL, then times the list endpoint's search queries. Run against a
+scratch database, never production:
+
+    DATABASE_URL=postgresql+asyncpg://.../medbill_bench python -m benchmarks.note_search --seed
+    python -m benchmarks.note_search --runs 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import select, text
+
+from app.database import async_session, engine
+from app.models.billing_note import BillingNote
+from app.services.search_service import apply_note_search, is_ranked_search
+
+FIRST_NAMES = ["James", "Maria", "Robert", "Linda", "Michael", "Patricia", "David", "Jennifer", "Wei", "Aisha",
+               "Carlos", "Priya", "John", "Elena", "Ahmed", "Sofia", "Daniel", "Grace", "Kenji", "Olga"]
+LAST_NAMES = ["Smith", "Garcia", "Johnson", "Nguyen", "Brown", "Patel", "Miller", "Kim", "Davis", "Lopez",
+              "Wilson", "Chen", "Anderson", "Okafor", "Thomas", "Ivanova", "Moore", "Haddad", "Martin", "Sato"]
+
+SEED_SQL = """
+WITH doc AS (
+    INSERT INTO documents (id, filename, file_path, uploaded_at)
+    VALUES (gen_random_uuid(), 'bench.pdf', 'bench/bench.pdf', now())
+    RETURNING id
+), names AS (
+    SELECT CAST(:first AS text[]) AS first, CAST(:last AS text[]) AS last
+)
+INSERT INTO billing_notes (id, document_id, patient_name, provider_name, status, created_at, updated_at)
+SELECT
+    gen_random_uuid(),
+    doc.id,
+    names.first[1 + (random() * (array_length(names.first, 1) - 1))::int] || ' '
+        || names.last[1 + (random() * (array_length(names.last, 1) - 1))::int] || ' ' || g,
+    'Dr. ' || names.last[1 + (random() * (array_length(names.last, 1) - 1))::int],
+    (ARRAY['draft', 'reviewed', 'finalized'])[1 + (g % 3)],
+    now() - (g || ' seconds')::interval,
+    now()
+FROM doc, names, generate_series(1, CAST(:rows AS integer)) AS g
+"""
+
+
+async def seed(rows: int) -> None:
+    async with async_session() as db:
+        await db.execute(text(SEED_SQL), {"first": FIRST_NAMES, "last": LAST_NAMES, "rows": rows})
+        await db.commit()
+        await db.execute(text("ANALYZE billing_notes"))
+        await db.commit()
+    print(f"seeded {rows} billing notes")
+
+
+def _terms() -> list[str]:
+    terms = []
+    for name in FIRST_NAMES + LAST_NAMES:
+        terms.append(name[:2].lower())  # prefix fast path
+        terms.append(name.lower())  # trigram path
+        terms.append(name[1:5].lower())  # mid-word substring
+    return terms
+
+
+async def run(runs: int, limit: int) -> None:
+    timings: dict[str, list[float]] = {"prefix": [], "trigram": []}
+    terms = _terms()
+    async with async_session() as db:
+        for _ in range(runs):
+            term = random.choice(terms)
+            query = apply_note_search(select(BillingNote), term)
+            query = query.order_by(BillingNote.created_at.desc(), BillingNote.id.desc()).limit(limit)
+            started = time.perf_counter()
+            await db.execute(query)
+            timings["trigram" if is_ranked_search(term) else "prefix"].append(time.perf_counter() - started)
+
+    for path, samples in timings.items():
+        if len(samples) < 2:
+            continue
+        cuts = statistics.quantiles(samples, n=100)
+        print(
+            f"{path:8s} n={len(samples):4d}  p50={cuts[49] * 1000:7.2f}ms  "
+            f"p95={cuts[94] * 1000:7.2f}ms  p99={cuts[98] * 1000:7.2f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="insert synthetic notes before measuring")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    # One event loop for both phases: pooled asyncpg connections are bound to the loop that opened them
+    async def _main() -> None:
+        try:
+            if args.seed:
+                await seed(args.rows)
+            await run(args.runs, args.limit)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare serial and page-parallel PDF text extraction.
+
+Usage:
+    python -m benchmarks.pdf_extraction path/to/report.pdf [--runs 3] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.services import pdf_service
+
+
+def _count_pages(path: str) -> int:
+    # A minimum of 0 pages makes _extract_if_short return the count without parsing
+    page_count, _ = pdf_service._extract_if_short(path, 0)
+    return page_count
+
+
+def _time_serial(path: str) -> tuple[float, str]:
+    start = time.perf_counter()
+    text, _ = pdf_service.extract_text_from_pdf(path)
+    return time.perf_counter() - start, text
+
+
+async def _time_parallel(path: str, executor: ProcessPoolExecutor) -> tuple[float, str]:
+    start = time.perf_counter()
+    page_count = _count_pages(path)
+    pages = await pdf_service._extract_pages_parallel(path, page_count, executor)
+    text = pdf_service.join_pages(pages)
+    return time.perf_counter() - start, text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=pdf_service.settings.PDF_EXTRACT_WORKERS)
+    args = parser.parse_args()
+
+    pdf_service.settings.PDF_EXTRACT_WORKERS = args.workers
+    page_count = _count_pages(args.pdf)
+
+    serial = []
+    for _ in range(args.runs):
+        elapsed, serial_text = _time_serial(args.pdf)
+        serial.append(elapsed)
+
+    parallel = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=pdf_service._warm_worker) as executor:
+        # Warm the pool so process start-up is not counted
+        executor.submit(_count_pages, args.pdf).result()
+        for _ in range(args.runs):
+            elapsed, parallel_text = asyncio.run(_time_parallel(args.pdf, executor))
+            parallel.append(elapsed)
+
+    if parallel_text != serial_text:
+        raise SystemExit("Parallel output differs from serial output")
+
+    serial_median = statistics.median(serial)
+    parallel_median = statistics.median(parallel)
+    print(f"pages:    {page_count}")
+    print(f"workers:  {args.workers}")
+    print(f"serial:   {serial_median:.3f}s (median of {args.runs})")
+    print(f"parallel: {parallel_median:.3f}s (median of {args.runs})")
+    print(f"speedup:  {serial_median / parallel_median:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""End-to-end pipeline benchmark with no external services.
+
+Generates a synthetic PDF corpus, uploads it through the API (in-process, via
+ASGITransport), drains the extraction jobs with in-process workers and reads
+the resulting ``processing_runs`` rows. Claude is replaced by the fake server
+in ``benchmarks.fake_anthropic`` and storage by the local backend, so the only
+real dependency is a scratch Postgres database:
+
+    DATABASE_URL=postgresql+asyncpg://.../medbill_bench python -m benchmarks.pipeline --create-schema
+    python -m benchmarks.pipeline --docs 200 --pages 1-40 --workers 4 --llm-latency 2.0
+
+Reports docs/sec and p50/p95/p99 per pipeline stage and per API route.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from benchmarks.corpus import generate_corpus, parse_range
+from benchmarks.fake_anthropic import serve_in_thread
+
+
+def _configure_env(args: argparse.Namespace, storage_dir: Path) -> None:
+    # Settings are read at import time, so this must run before importing app.*
+    os.environ["ANTHROPIC_BASE_URL"] = f"http://127.0.0.1:{args.llm_port}"
+    os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+    os.environ["STORAGE_BACKEND"] = "local"
+    os.environ["LOCAL_STORAGE_DIR"] = str(storage_dir)
+
+
+async def create_schema() -> None:
+    from sqlalchemy import text
+
+    import app.models  # noqa: F401  (registers every table on Base.metadata)
+    from app.database import Base, engine
+
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.create_all)
+    print("schema created")
+
+
+def _report(title: str, samples: dict[str, list[float]]) -> None:
+    print(f"\n{title}")
+    for name, values in samples.items():
+        if len(values) < 2:
+            print(f"  {name:28s} n={len(values):5d}")
+            continue
+        cuts = statistics.quantiles(values, n=100)
+        print(
+            f"  {name:28s} n={len(values):5d}  p50={cuts[49]:9.1f}ms  "
+            f"p95={cuts[94]:9.1f}ms  p99={cuts[98]:9.1f}ms"
+        )
+
+
+async def _timed(route_ms: dict[str, list[float]], route: str, request):
+    started = time.perf_counter()
+    response = await request
+    route_ms[route].append((time.perf_counter() - started) * 1000)
+    response.raise_for_status()
+    return response
+
+
+async def _upload_all(client, paths: list[Path], concurrency: int, route_ms) -> list[str]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upload(path: Path) -> str:
+        async with semaphore:
+            with open(path, "rb") as f:
+                response = await _timed(
+                    route_ms,
+                    "POST /api/documents/upload",
+                    client.post("/api/documents/upload", files={"file": (path.name, f, "application/pdf")}),
+                )
+            return response.json()["id"]
+
+    return await asyncio.gather(*(upload(path) for path in paths))
+
+
+async def _drain_jobs(workers: int) -> None:
+    from app.database import async_session
+    from app.services.job_service import claim_next_job, run_job
+
+    async def worker() -> None:
+        while True:
+            async with async_session() as db:
+                job = await claim_next_job(db)
+                if job is None:
+                    return
+                await run_job(db, job)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+
+async def _read_routes(client, document_ids: list[str], route_ms) -> None:
+    for document_id in document_ids:
+        await _timed(route_ms, "GET /api/documents/{id}", client.get(f"/api/documents/{document_id}"))
+    cursor = None
+    while True:
+        params = {"limit": 50}
+        if cursor:
+            params["cursor"] = cursor
+        response = await _timed(route_ms, "GET /api/documents", client.get("/api/documents", params=params))
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    for _ in range(len(document_ids) // 10 + 1):
+        await _timed(route_ms, "GET /api/billing-notes", client.get("/api/billing-notes", params={"limit": 50}))
+        await _timed(route_ms, "GET /api/billing-notes/stats", client.get("/api/billing-notes/stats"))
+
+
+async def _stage_timings(document_ids: list[str]) -> tuple[dict[str, list[float]], int]:
+    import uuid
+
+    from sqlalchemy import select
+
+    from app.database import async_session
+    from app.models.processing_run import ProcessingRun
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(ProcessingRun.status, ProcessingRun.total_ms, ProcessingRun.stages).where(
+                ProcessingRun.document_id.in_([uuid.UUID(d) for d in document_ids])
+            )
+        )
+        rows = result.all()
+
+    stage_ms: dict[str, list[float]] = defaultdict(list)
+    failed = 0
+    for status, total_ms, stages in rows:
+        if status != "succeeded":
+            failed += 1
+            continue
+        stage_ms["total"].append(total_ms)
+        for span in stages:
+            stage_ms[span["name"]].append(span["ms"])
+    return stage_ms, failed
+
+
+async def run(args: argparse.Namespace, corpus_dir: Path) -> None:
+    import httpx
+
+    from app.main import app
+    from app.services.claude_service import close_client, init_client
+    from app.services.pdf_service import shutdown_extraction_executor
+
+    paths = generate_corpus(corpus_dir, args.docs, *args.pages, seed=int(time.time()))
+    route_ms: dict[str, list[float]] = defaultdict(list)
+
+    # ASGITransport does not run the lifespan hook; set up what it would
+    init_client()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            started = time.perf_counter()
+            document_ids = await _upload_all(client, paths, args.upload_concurrency, route_ms)
+            uploaded = time.perf_counter()
+            await _drain_jobs(args.workers)
+            drained = time.perf_counter()
+            await _read_routes(client, document_ids, route_ms)
+    finally:
+        await close_client()
+        shutdown_extraction_executor()
+
+    stage_ms, failed = await _stage_timings(document_ids)
+    print(f"\n{len(paths)} documents, {args.workers} workers, fake LLM latency {args.llm_latency}s")
+    print(f"  upload:     {len(paths) / (uploaded - started):8.2f} docs/sec")
+    print(f"  extraction: {len(paths) / (drained - uploaded):8.2f} docs/sec ({failed} failed runs)")
+    _report("pipeline stages", stage_ms)
+    _report("routes", route_ms)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--create-schema", action="store_true", help="create tables on the scratch database and exit")
+    parser.add_argument("--docs", type=int, default=50)
+    parser.add_argument("--pages", type=parse_range, default=(1, 10), help="page count range, e.g. 1-40")
+    parser.add_argument("--workers", type=int, default=4, help="in-process job workers")
+    parser.add_argument("--upload-concurrency", type=int, default=8)
+    parser.add_argument("--llm-port", type=int, default=8765)
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="mean fake Claude response time in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="medbill-bench-") as tmp:
+        _configure_env(args, Path(tmp) / "storage")
+        if args.create_schema:
+            asyncio.run(create_schema())
+            return
+        server = serve_in_thread(args.llm_port, latency=args.llm_latency, jitter=args.llm_jitter)
+        try:
+            asyncio.run(run(args, Path(tmp) / "corpus"))
+        finally:
+            server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
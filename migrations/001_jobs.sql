@@ -0,0 +1,15 @@
+-- Extraction job queue drained by the worker (python -m app.worker).
+CREATE TABLE IF NOT EXISTS jobs (
+    id UUID PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL DEFAULT 'extract_document',
+    document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    billing_note_id UUID,
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_jobs_status_created_at ON jobs (status, created_at);
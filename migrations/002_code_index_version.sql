@@ -0,0 +1,10 @@
+-- Version stamp for the in-memory CPT/ICD-10 code index.
+-- After loading or editing cpt_codes / icd10_codes run:
+--   UPDATE code_index_version SET version = version + 1, updated_at = now() WHERE id = 1;
+CREATE TABLE IF NOT EXISTS code_index_version (
+    id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+INSERT INTO code_index_version (id, version) VALUES (1, 1) ON CONFLICT (id) DO NOTHING;
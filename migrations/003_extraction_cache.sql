@@ -0,0 +1,7 @@
+-- Claude extraction results keyed by sha256(text, prompt, tool schema, model).
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    model VARCHAR(100) NOT NULL,
+    result JSONB NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT now()
+);
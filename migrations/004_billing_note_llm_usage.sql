@@ -0,0 +1,7 @@
+-- Per-note Claude usage, including prompt-cache reads/writes.
+ALTER TABLE billing_notes
+    ADD COLUMN IF NOT EXISTS llm_input_tokens INTEGER,
+    ADD COLUMN IF NOT EXISTS llm_output_tokens INTEGER,
+    ADD COLUMN IF NOT EXISTS llm_cache_read_tokens INTEGER,
+    ADD COLUMN IF NOT EXISTS llm_cache_creation_tokens INTEGER,
+    ADD COLUMN IF NOT EXISTS llm_latency_ms INTEGER;
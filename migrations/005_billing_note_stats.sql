@@ -0,0 +1,17 @@
+-- Dashboard counters maintained transactionally when BILLING_STATS_USE_COUNTERS is on.
+CREATE TABLE IF NOT EXISTS billing_note_stats (
+    bucket VARCHAR(20) PRIMARY KEY,
+    count BIGINT NOT NULL DEFAULT 0
+);
+
+-- Backfill (re-run before turning BILLING_STATS_USE_COUNTERS on if counters were disabled for a while).
+BEGIN;
+LOCK TABLE billing_notes, documents IN SHARE MODE;
+DELETE FROM billing_note_stats;
+INSERT INTO billing_note_stats (bucket, count)
+SELECT 'total', count(*) FROM billing_notes
+UNION ALL
+SELECT status, count(*) FROM billing_notes GROUP BY status
+UNION ALL
+SELECT 'documents', count(*) FROM documents;
+COMMIT;
@@ -0,0 +1,3 @@
+-- Composite indexes backing cursor pagination on (created_at, id) / (uploaded_at, id).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_billing_notes_created_at_id ON billing_notes (created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_uploaded_at_id ON documents (uploaded_at DESC, id DESC);
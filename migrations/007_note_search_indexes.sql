@@ -0,0 +1,11 @@
+-- Patient/provider name search: pg_trgm GIN indexes plus lower() prefix indexes.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_billing_notes_patient_name_trgm
+    ON billing_notes USING gin (patient_name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_billing_notes_provider_name_trgm
+    ON billing_notes USING gin (provider_name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_billing_notes_patient_name_prefix
+    ON billing_notes (lower(patient_name) text_pattern_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_billing_notes_provider_name_prefix
+    ON billing_notes (lower(provider_name) text_pattern_ops);
@@ -0,0 +1,4 @@
+-- Unique index for hash-based duplicate detection.
+-- Fails if duplicates already exist; find them with:
+--   SELECT file_hash, count(*) FROM documents WHERE file_hash IS NOT NULL GROUP BY 1 HAVING count(*) > 1;
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_file_hash ON documents (file_hash);
@@ -0,0 +1,3 @@
+-- Group extraction jobs created by POST /api/documents/batch.
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS batch_id UUID;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_batch_id ON jobs (batch_id);
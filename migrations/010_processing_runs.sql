@@ -0,0 +1,14 @@
+-- One row per process_document attempt with per-stage timings.
+CREATE TABLE IF NOT EXISTS processing_runs (
+    id UUID PRIMARY KEY,
+    document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    billing_note_id UUID,
+    status VARCHAR(20) NOT NULL,
+    started_at TIMESTAMP NOT NULL DEFAULT now(),
+    finished_at TIMESTAMP,
+    total_ms INTEGER,
+    stages JSONB NOT NULL DEFAULT '[]',
+    error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS ix_processing_runs_document_id ON processing_runs (document_id);
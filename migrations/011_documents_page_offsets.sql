@@ -0,0 +1,3 @@
+-- Character offsets of each page in documents.extracted_text, for GET /api/documents/{id}/text.
+-- Rows extracted earlier are filled in on first request.
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS page_offsets JSONB;
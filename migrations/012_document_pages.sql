@@ -0,0 +1,11 @@
+-- Extracted text stored per page; documents.extracted_text is only kept for
+-- documents extracted before this table existed.
+CREATE TABLE IF NOT EXISTS document_pages (
+    id UUID PRIMARY KEY,
+    document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    page_number INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    char_count INTEGER NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,
+    CONSTRAINT uq_document_pages_document_page UNIQUE (document_id, page_number)
+);
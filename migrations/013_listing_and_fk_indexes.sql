@@ -0,0 +1,7 @@
+-- Status-filtered note listings ordered by (created_at, id), per-status counts,
+-- and the child-table foreign keys used by selectinload and ON DELETE CASCADE.
+-- documents(uploaded_at DESC) is already covered by ix_documents_uploaded_at_id (006).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_billing_notes_status_created_at_id
+    ON billing_notes (status, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_extracted_codes_billing_note_id ON extracted_codes (billing_note_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_extracted_diagnoses_billing_note_id ON extracted_diagnoses (billing_note_id);
@@ -0,0 +1,2 @@
+-- Earliest time a retried job may be claimed again (exponential backoff).
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS run_after TIMESTAMP;